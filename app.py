@@ -1,30 +1,80 @@
 import sys
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any
 
+from PyQt6.QtCore import QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import QApplication, QMainWindow
-from model.options_parser.options_parser import OptionsParser
-from model.tab_handlers.SMEAR_tab_handler import SMEARTabHandler
-from model.tab_handlers.STATFI_tab_handler import STATFITabHandler
-from model.tab_handlers.tab_handler import TabHandler
-from model.tab_handlers.compare_tab_handler import CompareTabHandler
 from ui.Ui_main_window import Ui_MainWindow
 
+# The tab handlers load matplotlib, numpy and requests, so they are imported once
+# the window is shown.
+if TYPE_CHECKING:
+    from model.options_parser.options_parser import OptionsParser
+    from model.tab_handlers.tab_handler import TabHandler
+
 
 class Window(QMainWindow, Ui_MainWindow):
-    _SMEAR_tab_handler: SMEARTabHandler
-    _STATFI_tab_handler: STATFITabHandler
-    _compare_tab_handler: CompareTabHandler
+    # Emitted when the shown tab has been built and the window responds.
+    initialized = pyqtSignal()
+
+    # Tab handlers by tab name, built when the tab is first shown or needed.
+    _tab_handlers: dict[str, "TabHandler"]
+    # Options loaded for hidden tabs, applied and fetched when the tab is shown.
+    _pending_tab_options: dict[str, Any]
+    _options_parser: "OptionsParser"
+    _is_initialized: bool
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setupUi(self)
-        self._initTabHandlers()
-        self._options_parser = OptionsParser(self)
+        self._tab_handlers = {}
+        self._pending_tab_options = {}
+        self._is_initialized = False
         self._connectSignalsSlots()
+        # The shown tab is built from the event loop, so a shown window is
+        # painted first, and a window that is never shown is still initialized.
+        QTimer.singleShot(0, self._initializeAfterPaint)
+
+    def _initializeAfterPaint(self):
+        if self.isVisible() and not self.windowHandle().isExposed():
+            # Shown but not on screen yet: wait until it has been painted.
+            QTimer.singleShot(0, self._initializeAfterPaint)
+            return
+        self._initialize()
+
+    def _initialize(self):
+        if self._is_initialized:
+            return
+        self._is_initialized = True
+        from model.options_parser.options_parser import OptionsParser
+
+        self._options_parser = OptionsParser(self)
+        self.getTabHandler(self._getShownTabName())
+        self.initialized.emit()
 
-    def getTabHandler(self, tab_name: str) -> TabHandler:
-        return getattr(self, f"_{tab_name}_tab_handler")
+    def getTabHandler(self, tab_name: str) -> "TabHandler":
+        if tab_name not in self._tab_handlers:
+            self._tab_handlers[tab_name] = self._createTabHandler(tab_name)
+        return self._tab_handlers[tab_name]
+
+    def getTabOptions(self, tab_name: str) -> Any:
+        if tab_name in self._pending_tab_options:
+            return self._pending_tab_options[tab_name]
+        return self.getTabHandler(tab_name).getUIOptions()
+
+    def setTabOptions(self, tab_name: str, options: Any):
+        """Show the options in the tab and fetch their data. For a hidden tab the
+        options are kept until it is shown, and meanwhile their data is prefetched
+        into the caches at a low priority.
+        """
+        if tab_name == self._getShownTabName():
+            self._applyTabOptions(tab_name, options)
+            return
+        self._pending_tab_options[tab_name] = options
+        self._prefetchTabData(tab_name, options)
 
     def _connectSignalsSlots(self):
+        self.tabWidget.currentChanged.connect(self._showTab)
         self.SMEAR_fetch_button.clicked.connect(self._fetchAndPlot)
         self.STATFI_fetch_button.clicked.connect(self._fetchAndPlot)
         self.compare_fetch_button.clicked.connect(self._fetchAndPlot)
@@ -35,43 +85,106 @@ class Window(QMainWindow, Ui_MainWindow):
         self.SMEAR_save_plot_button.clicked.connect(self._savePlot)
         self.STATFI_save_plot_button.clicked.connect(self._savePlot)
         self.compare_save_plot_button.clicked.connect(self._savePlot)
-        self.actionExport_Settings.triggered.connect(self._options_parser.saveOptions)
-        self.actionImport_Settings.triggered.connect(self._options_parser.loadOptions)
+        self.actionExport_Settings.triggered.connect(self._exportOptions)
+        self.actionImport_Settings.triggered.connect(self._importOptions)
 
-    def _initTabHandlers(self):
-        self._SMEAR_tab_handler = SMEARTabHandler(
-            self,
-            self.SMEAR_gas_group,
-            self.SMEAR_stations_list,
-            self.SMEAR_start_time_edit,
-            self.SMEAR_end_time_edit,
-            self.SMEAR_aggregation_group,
-            self.SMEAR_fetch_button,
-            self.SMEAR_plot,
-            self.SMEAR_summary_button,
-            self.SMEAR_save_plot_button,
-        )
-        self._STATFI_tab_handler = STATFITabHandler(
-            self,
-            self.STATFI_figures_list,
-            self.STATFI_years_list,
-            self.STATFI_visualization_group,
-            self.STATFI_fetch_button,
-            self.STATFI_plot,
-            self.STATFI_save_plot_button,
-        )
-        self._compare_tab_handler = CompareTabHandler(
+    def _createTabHandler(self, tab_name: str) -> "TabHandler":
+        if tab_name == "SMEAR":
+            from model.tab_handlers.SMEAR_tab_handler import SMEARTabHandler
+
+            return SMEARTabHandler(
+                self,
+                self.SMEAR_gas_group,
+                self.SMEAR_stations_list,
+                self.SMEAR_start_time_edit,
+                self.SMEAR_end_time_edit,
+                self.SMEAR_aggregation_group,
+                self.SMEAR_fetch_button,
+                self.SMEAR_plot,
+                self.SMEAR_summary_button,
+                self.SMEAR_save_plot_button,
+            )
+        if tab_name == "STATFI":
+            from model.tab_handlers.STATFI_tab_handler import STATFITabHandler
+
+            return STATFITabHandler(
+                self,
+                self.STATFI_figures_list,
+                self.STATFI_years_list,
+                self.STATFI_visualization_group,
+                self.STATFI_fetch_button,
+                self.STATFI_plot,
+                self.STATFI_save_plot_button,
+            )
+        if tab_name == "compare":
+            from model.tab_handlers.compare_tab_handler import CompareTabHandler
+
+            return CompareTabHandler(
+                self,
+                self.compare_STATFI_figures_list,
+                self.compare_STATFI_years_list,
+                self.compare_SMEAR_gas_group,
+                self.compare_SMEAR_stations_list,
+                self.compare_SMEAR_years_list,
+                self.compare_fetch_button,
+                self.compare_plot,
+                self.compare_save_plot_button,
+            )
+        raise ValueError(f"Unknown tab {tab_name}")
+
+    def _showTab(self):
+        tab_name = self._getShownTabName()
+        if tab_name in self._pending_tab_options:
+            self._applyTabOptions(tab_name, self._pending_tab_options.pop(tab_name))
+        else:
+            self.getTabHandler(tab_name)
+
+    def _applyTabOptions(self, tab_name: str, options: Any):
+        from model.utils.fetch_scheduler import FETCH_SCHEDULER
+
+        # A prefetch not started yet is not needed anymore.
+        FETCH_SCHEDULER.cancel((self, f"{tab_name} prefetch"))
+        tab_handler = self.getTabHandler(tab_name)
+        tab_handler.setUIOptions(options)
+        tab_handler.fetchAndVisualise()
+
+    def _prefetchTabData(self, tab_name: str, options: Any):
+        from model.utils.fetch_scheduler import FETCH_SCHEDULER, FetchPriority
+        from model.utils.request_builder import SMEAR_HOST, STATFI_HOST
+        from model.utils.result_builder import ResultBuilder
+
+        build, hosts = {
+            "SMEAR": (ResultBuilder.buildSMEARResult, [SMEAR_HOST]),
+            "STATFI": (ResultBuilder.buildSTATFIResult, [STATFI_HOST]),
+            "compare": (
+                ResultBuilder.buildComparisonResult,
+                [STATFI_HOST, SMEAR_HOST],
+            ),
+        }[tab_name]
+        # A copy, as fetching can sort the lists of the options in the worker.
+        FETCH_SCHEDULER.schedule(
+            (self, f"{tab_name} prefetch"),
+            build,
+            deepcopy(options),
             self,
-            self.compare_STATFI_figures_list,
-            self.compare_STATFI_years_list,
-            self.compare_SMEAR_gas_group,
-            self.compare_SMEAR_stations_list,
-            self.compare_SMEAR_years_list,
-            self.compare_fetch_button,
-            self.compare_plot,
-            self.compare_save_plot_button,
+            "_onTabDataPrefetched",
+            FetchPriority.PREFETCH,
+            hosts,
         )
 
+    @pyqtSlot(object)
+    def _onTabDataPrefetched(self, _result):
+        # The data is in the caches now, the tab fetches it from there when shown.
+        pass
+
+    def _exportOptions(self):
+        self._initialize()
+        self._options_parser.saveOptions()
+
+    def _importOptions(self):
+        self._initialize()
+        self._options_parser.loadOptions()
+
     def _fetchAndPlot(self):
         self._getCurrentTabHandler().fetchAndVisualise()
 
@@ -81,12 +194,15 @@ class Window(QMainWindow, Ui_MainWindow):
     def _savePlot(self):
         self._getCurrentTabHandler().savePlot(self)
 
-    def _getCurrentTabHandler(self) -> TabHandler:
+    def _getCurrentTabHandler(self) -> "TabHandler":
         tab_name = self.sender().objectName().split("_")[0]
         return self.getTabHandler(tab_name)
 
+    def _getShownTabName(self) -> str:
+        return self.tabWidget.currentWidget().objectName().split("_")[0]
+
     def _showSMEARSummary(self):
-        self._SMEAR_tab_handler.showAggregatedInfo()
+        self.getTabHandler("SMEAR").showAggregatedInfo()  # type: ignore
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""Longest time the GUI thread is blocked while a large SMEAR fetch is delivered,
+with the stations built in the GUI thread as before and in the worker thread.
+
+Run from the project root: poetry run python -m benchmarks.gui_block_benchmark
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import numpy as np
+from PyQt6.QtCore import QEventLoop, QObject, QThreadPool, QTimer, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+
+from model.data_models.user_options import SMEARAggregation, SMEARGas, SMEAROptions
+from model.factories.station_factory import StationFactory  # type: ignore
+from model.utils.consts import SMEAR_VARIABLES_BY_STATION  # type: ignore
+from model.utils.data_fetcher_wrapper import DataFetcherWrapper  # type: ignore
+from model.utils.gui_block_monitor import GUIBlockMonitor  # type: ignore
+from model.utils.result_builder import ResultBuilder  # type: ignore
+
+
+def createSyntheticOptions(days: int) -> tuple[SMEAROptions, SMEAROptions]:
+    # Raw minute data of all CO2 stations, shown as hourly averages.
+    station_names = [
+        station
+        for station, gas in SMEAR_VARIABLES_BY_STATION
+        if gas == SMEARGas.CO2.value
+    ]
+    start = datetime(2021, 1, 1)
+    options = SMEAROptions(
+        SMEARGas.CO2,
+        SMEARAggregation.AVG,
+        start,
+        start + timedelta(days=days),
+        station_names,
+    )
+    source_options = SMEAROptions(
+        SMEARGas.CO2,
+        SMEARAggregation.NONE,
+        start,
+        start + timedelta(days=days),
+        station_names,
+        "1",
+    )
+    return options, source_options
+
+
+def createSyntheticData(
+    options: SMEAROptions, days: int, missing_ratio: float = 0.05
+) -> dict[str, Any]:
+    # Same columnar layout as a decoded SMEAR response, sampled every minute.
+    station_ids = [
+        f"{table}.{variable}"
+        for table, variable in zip(options.table_names, options.variable_names)
+    ]
+    random = np.random.default_rng(0)
+    row_count = days * 24 * 60
+    values = {}
+    for station_id in station_ids:
+        station_values = random.normal(410, 10, row_count).round(3)
+        station_values[random.random(row_count) < missing_ratio] = np.nan
+        values[station_id] = station_values
+    samptimes = np.datetime64("2021-01-01T00:00", "ms") + np.arange(
+        row_count
+    ) * np.timedelta64(1, "m")
+    return {"columns": station_ids, "samptimes": samptimes, "values": values}
+
+
+class _Receiver(QObject):
+    # Stands in for a tab handler, with a slot for each way of delivering data.
+
+    def __init__(self, options: SMEAROptions, source_options: SMEAROptions):
+        super().__init__()
+        self._options = options
+        self._source_options = source_options
+        self.on_done: Callable[[], None] = lambda: None
+
+    @pyqtSlot(object)
+    def receiveData(self, data: dict[str, Any]):
+        # What the SMEAR tab did before: build, resample and summarise on arrival.
+        stations = ResultBuilder.resampleSMEARStations(
+            StationFactory.build(data),
+            self._source_options,
+            self._options.aggregation_method,
+        )
+        for station in stations:
+            station.getSummaryPyramid()
+        self.on_done()
+
+    @pyqtSlot(object)
+    def receiveResult(self, _result):
+        self.on_done()
+
+
+def measureMaxBlockTime(
+    receiver: _Receiver, callable: Callable[[Any], Any], param: Any, callback: str
+) -> float:
+    monitor = GUIBlockMonitor()
+    loop = QEventLoop()
+    # Waits a little after the slot, so that the monitor notices its block.
+    receiver.on_done = lambda: QTimer.singleShot(50, loop.quit)
+    monitor.start()
+    QThreadPool.globalInstance().start(
+        DataFetcherWrapper(receiver, callable, param, callback)
+    )
+    loop.exec()
+    monitor.stop()
+    return monitor.getMaxBlockTime()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication([])
+    options, source_options = createSyntheticOptions(args.days)
+    data = createSyntheticData(source_options, args.days)
+    receiver = _Receiver(options, source_options)
+    print(
+        f"{len(data['samptimes'])} rows x {len(data['columns'])} stations, "
+        f"worst of {args.repeats}"
+    )
+
+    before = max(
+        measureMaxBlockTime(receiver, lambda data: data, data, "receiveData")
+        for _ in range(args.repeats)
+    )
+    after = max(
+        measureMaxBlockTime(
+            receiver,
+            lambda data: ResultBuilder.buildSMEARResultFromData(
+                options, source_options, data
+            ),
+            data,
+            "receiveResult",
+        )
+        for _ in range(args.repeats)
+    )
+    print(f"built in the GUI thread: {before:8.1f} ms max block")
+    print(f"built in the worker:     {after:8.1f} ms max block")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Startup time of the app, measured in fresh processes: the time to import app,
+the time to the first paint of the window, and the time until the tab handlers
+are built and the window responds, all from the start of the process.
+
+Run from the project root: poetry run python -m benchmarks.startup_benchmark
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measureStartup(process_start: float) -> dict[str, float]:
+    # Runs in the child process. Times are in ms since the process was started.
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    def elapsed() -> float:
+        return (time.time() - process_start) * 1000
+
+    import app as app_module
+
+    times = {"import": elapsed()}
+    application = QApplication([])
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and "first window" not in times:
+                times["first window"] = elapsed()
+            return False
+
+    window = app_module.Window()
+    paint_filter = _FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+
+    def onInitialized():
+        # Interactive once the events queued by the initialization are handled.
+        def onIdle():
+            times["interactive"] = elapsed()
+            application.quit()
+
+        QTimer.singleShot(0, onIdle)
+
+    window.initialized.connect(onInitialized)
+    window.show()
+    application.exec()
+    return times
+
+
+def runChild() -> dict[str, float]:
+    # The child is timed from just before it is started, interpreter included.
+    start = time.time()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_benchmark", "--child", str(start)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(measureStartup(args.child)), flush=True)
+        # Background fetches started by the tabs are not waited for.
+        os._exit(0)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    runs = [runChild() for _ in range(args.repeats)]
+    print(f"median of {args.repeats} fresh processes, ms since process start")
+    for name in ("import", "first window", "interactive"):
+        print(f"{name + ':':14}{statistics.median(run[name] for run in runs):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
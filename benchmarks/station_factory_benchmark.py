@@ -0,0 +1,103 @@
+"""Rows per second of StationFactory.build, before and after vectorization.
+
+Run from the project root: poetry run python -m benchmarks.station_factory_benchmark
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import numpy as np
+
+from model.data_models.station import Station
+from model.factories.station_factory import StationFactory  # type: ignore
+from model.utils.consts import ALL_SMEAR_STATIONS  # type: ignore
+
+
+def createSyntheticData(
+    station_count: int, days: int, missing_ratio: float = 0.05
+) -> dict[str, Any]:
+    # Same row-based layout as the SMEAR API response, sampled every minute.
+    station_ids = [
+        f"{gas_info['table']}.{gas_info['variable']}"
+        for station in ALL_SMEAR_STATIONS.values()
+        for gas_info in station.values()
+    ][:station_count]
+    random = np.random.default_rng(0)
+    row_count = days * 24 * 60
+    values = random.normal(410, 10, (row_count, len(station_ids))).round(3)
+    is_missing = random.random((row_count, len(station_ids))) < missing_ratio
+    start = datetime(2021, 1, 1)
+    rows = []
+    for row_index in range(row_count):
+        row: dict[str, Any] = {
+            "samptime": (start + timedelta(minutes=row_index)).strftime(
+                "%Y-%m-%dT%H:%M:%S.000"
+            )
+        }
+        for column_index, station_id in enumerate(station_ids):
+            row[station_id] = (
+                None
+                if is_missing[row_index, column_index]
+                else float(values[row_index, column_index])
+            )
+        rows.append(row)
+    return {"columns": station_ids, "data": rows}
+
+
+def buildBeforeVectorization(data: dict[str, Any]) -> list[Station]:
+    # StationFactory.build as it was before: one pass over the rows per station
+    # and strptime for every available value.
+    stations = []
+    datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
+    for station_id in data["columns"]:
+        station = Station(station_id)
+        timestamps = []
+        concentrations = []
+        for concentration_data in data["data"]:
+            concentration: float = concentration_data[station_id]
+            if concentration is not None:
+                timestamps.append(
+                    datetime.strptime(concentration_data["samptime"], datetime_format)
+                )
+                concentrations.append(concentration)
+        station.setTimeStamps(timestamps)
+        station.setConcentrations(concentrations)
+        stations.append(station)
+    return stations
+
+
+def measureRowsPerSecond(
+    build: Callable[[dict[str, Any]], list[Station]],
+    data: dict[str, Any],
+    repeats: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build(data)
+        best = min(best, time.perf_counter() - start)
+    return len(data["data"]) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    data = createSyntheticData(args.stations, args.days)
+    print(
+        f"{len(data['data'])} rows x {len(data['columns'])} stations, "
+        f"best of {args.repeats}"
+    )
+    before = measureRowsPerSecond(buildBeforeVectorization, data, args.repeats)
+    after = measureRowsPerSecond(StationFactory.build, data, args.repeats)
+    print(f"before: {before:12,.0f} rows/s")
+    print(f"after:  {after:12,.0f} rows/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
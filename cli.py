@@ -0,0 +1,228 @@
+"""Render exported options files without the window.
+
+Every tab of every options file (as exported from File -> Export) is fetched,
+using the same caches as the app, and saved as PNG and CSV files, for example
+`python3 cli.py options/ --output-dir plots`. The files are rendered in parallel
+processes with the Agg backend.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Sequence
+
+import matplotlib  # type: ignore
+
+# Set before any plot is made, Qt is never loaded.
+matplotlib.use("Agg")
+
+from model.api import (  # noqa: E402
+    fetchComparison,
+    fetchSMEARStations,
+    fetchSTATFIFigures,
+)
+from model.data_models.user_options import (  # noqa: E402
+    AllTabsOptions,
+    ComparePlotOptions,
+    SMEARPlotOptions,
+    STATFIPlotOptions,
+)
+from model.options_parser.options_serializer import OptionsSerializer  # noqa: E402
+from model.plotters.SMEAR_plotter import SMEARPlotter  # noqa: E402
+from model.plotters.STATFI_plotter import STATFIPlotter  # noqa: E402
+from model.plotters.compare_plotter import ComparePlotter  # noqa: E402
+from model.plotters.headless_plot import HeadlessPlot  # noqa: E402
+from model.plotters.plotter import Plotter  # noqa: E402
+from model.utils import consts  # type: ignore # noqa: E402
+from model.utils.csv_exporter import (  # type: ignore # noqa: E402
+    writeFiguresCSV,
+    writeStationsCSV,
+)
+from model.utils.STATFI_snapshot import STATFI_SNAPSHOT  # type: ignore # noqa: E402
+
+ALL_TABS = ("SMEAR", "STATFI", "compare")
+ALL_FORMATS = ("png", "csv")
+
+
+def renderOptionsFile(
+    file_name: str,
+    output_directory: str,
+    tabs: Sequence[str] = ALL_TABS,
+    formats: Sequence[str] = ALL_FORMATS,
+) -> list[str]:
+    """Fetch and save the given tabs of an options file as
+    <output_directory>/<file name>_<tab>.<format>, returning the files written.
+    Tabs with nothing selected are skipped.
+    """
+    options = OptionsSerializer.loadOptionsFile(file_name)
+    prefix = os.path.join(output_directory, Path(file_name).stem)
+    written: list[str] = []
+    for tab in tabs:
+        if tab == "SMEAR":
+            written += _renderSMEAR(options, prefix, formats)
+        elif tab == "STATFI":
+            written += _renderSTATFI(options, prefix, formats)
+        elif tab == "compare":
+            written += _renderComparison(options, prefix, formats)
+        else:
+            raise ValueError(f"Unknown tab {tab}")
+    return written
+
+
+def _renderSMEAR(
+    options: AllTabsOptions, prefix: str, formats: Sequence[str]
+) -> list[str]:
+    if not options.SMEAR.stations:
+        return []
+    stations = fetchSMEARStations(options.SMEAR)
+
+    written = []
+    if "png" in formats:
+        plotter = SMEARPlotter(HeadlessPlot())
+        if any(station.hasData() for station in stations):
+            plotter.plotData(
+                stations,
+                SMEARPlotOptions(options.SMEAR.gas, options.SMEAR.aggregation_method),
+            )
+        else:
+            plotter.showEmptyText()
+        written.append(_savePlot(plotter, f"{prefix}_SMEAR.png"))
+    if "csv" in formats:
+        writeStationsCSV(f"{prefix}_SMEAR.csv", stations)
+        written.append(f"{prefix}_SMEAR.csv")
+    return written
+
+
+def _renderSTATFI(
+    options: AllTabsOptions, prefix: str, formats: Sequence[str]
+) -> list[str]:
+    if not options.STATFI.figure_names or not options.STATFI.years:
+        return []
+    figures = fetchSTATFIFigures(options.STATFI)
+
+    written = []
+    if "png" in formats:
+        plotter = STATFIPlotter(HeadlessPlot())
+        if figures:
+            plotter.plotData(figures, STATFIPlotOptions(options.STATFI.plot_type))
+        else:
+            plotter.showEmptyText()
+        written.append(_savePlot(plotter, f"{prefix}_STATFI.png"))
+    if "csv" in formats:
+        writeFiguresCSV(f"{prefix}_STATFI.csv", figures)
+        written.append(f"{prefix}_STATFI.csv")
+    return written
+
+
+def _renderComparison(
+    options: AllTabsOptions, prefix: str, formats: Sequence[str]
+) -> list[str]:
+    if not options.compare.STATFI_figure_names or not options.compare.STATFI_years:
+        return []
+    figures, year_stations = fetchComparison(options.compare)
+
+    written = []
+    if "png" in formats:
+        plotter = ComparePlotter(HeadlessPlot())
+        if figures:
+            plotter.plotData(
+                [figures, year_stations], ComparePlotOptions(options.compare.SMEAR_gas)
+            )
+        else:
+            plotter.showEmptyText()
+        written.append(_savePlot(plotter, f"{prefix}_compare.png"))
+    if "csv" in formats:
+        # The figures and the stations of every year are saved separately.
+        writeFiguresCSV(f"{prefix}_compare_STATFI.csv", figures)
+        writeStationsCSV(
+            f"{prefix}_compare_SMEAR.csv",
+            [station for stations in year_stations for station in stations],
+        )
+        written += [f"{prefix}_compare_STATFI.csv", f"{prefix}_compare_SMEAR.csv"]
+    return written
+
+
+def _savePlot(plotter: Plotter, file_name: str) -> str:
+    plotter.savePlot(Path(file_name))
+    return file_name
+
+
+def _findOptionsFiles(paths: Sequence[str]) -> list[str]:
+    # Directories are searched for the JSON files directly in them.
+    file_names = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_names += sorted(str(file) for file in Path(path).glob("*.json"))
+        else:
+            file_names.append(path)
+    return file_names
+
+
+def _parseArguments(arguments: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render exported options files as PNG and CSV files."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="options JSON files, or directories of them"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="directory of the rendered files"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="options files rendered at a time (default: number of CPUs)",
+    )
+    parser.add_argument("--tabs", nargs="+", choices=ALL_TABS, default=list(ALL_TABS))
+    parser.add_argument(
+        "--formats", nargs="+", choices=ALL_FORMATS, default=list(ALL_FORMATS)
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str]) -> int:
+    args = _parseArguments(arguments)
+    file_names = _findOptionsFiles(args.paths)
+    if not file_names:
+        print("No options files found", file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Download a missing or old STATFI snapshot once here, not in every process.
+    if consts.USE_STATFI_SNAPSHOT and {"STATFI", "compare"} & set(args.tabs):
+        STATFI_SNAPSHOT.refresh()
+
+    failed = 0
+    # Spawned, so no process inherits the connections or threads of another.
+    with ProcessPoolExecutor(
+        max_workers=max(min(args.jobs, len(file_names)), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = {
+            executor.submit(
+                renderOptionsFile, file_name, args.output_dir, args.tabs, args.formats
+            ): file_name
+            for file_name in file_names
+        }
+        for future in as_completed(futures):
+            try:
+                for written_file in future.result():
+                    print(written_file)
+            except Exception as error:
+                # One bad options file must not stop the others from rendering.
+                failed += 1
+                print(
+                    f"{futures[future]}: {type(error).__name__}: {error}",
+                    file=sys.stderr,
+                )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,155 @@
+"""SMEAR and STATFI data as Station and Figure objects, without Qt.
+
+The same fetching, caching and decoding as the app, for use from scripts,
+notebooks and services:
+
+    from model.api import fetchSMEARStations
+    stations = fetchSMEARStations(SMEAROptions(...))
+    stations[0].getTimeStampsArray(), stations[0].getConcentrationsArray()
+
+Nothing here imports PyQt6 or sets a matplotlib backend.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Hashable, Sequence
+
+import numpy as np
+
+from model.data_models.figure import Figure
+from model.data_models.station import Station
+from model.data_models.user_options import (
+    CompareOptions,
+    SMEAROptions,
+    STATFIOptions,
+)
+from model.factories.figure_factory import FigureFactory  # type: ignore
+from model.utils import consts  # type: ignore
+from model.utils.data_fetcher import DataFetcher, isErrorDict  # type: ignore
+from model.utils.result_builder import ResultBuilder  # type: ignore
+
+
+class FetchError(Exception):
+    pass
+
+
+def fetchSMEARStations(options: SMEAROptions) -> list[Station]:
+    """The selected stations in the aggregation of the options, in the order of
+    options.stations. Raises FetchError when SMEAR cannot be reached.
+    """
+    result = ResultBuilder.buildSMEARResult(options)
+    if result.error_message is not None:
+        raise FetchError(result.error_message)
+    return list(result.stations)
+
+
+def fetchSMEARStationsBatch(
+    options_list: Sequence[SMEAROptions],
+    max_workers: int = consts.MAX_CONCURRENT_FETCHES,
+) -> list[list[Station]]:
+    """The stations of every options, as fetchSMEARStations would return them.
+    Options differing only by their stations are fetched as one request, and
+    the requests are made in parallel.
+    """
+    grouped: dict[Hashable, tuple[SMEAROptions, list[str]]] = {}
+    for options in options_list:
+        _, stations = grouped.setdefault(_getSMEARGroupKey(options), (options, []))
+        stations += [station for station in options.stations if station not in stations]
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        group_stations = dict(
+            zip(
+                grouped,
+                executor.map(
+                    fetchSMEARStations,
+                    [
+                        replace(options, stations=stations)
+                        for options, stations in grouped.values()
+                    ],
+                ),
+            )
+        )
+    results = []
+    for options in options_list:
+        stations_by_name = {
+            station.getName(): station
+            for station in group_stations[_getSMEARGroupKey(options)]
+        }
+        results.append(
+            [
+                stations_by_name[station]
+                for station in options.stations
+                if station in stations_by_name
+            ]
+        )
+    return results
+
+
+def fetchSTATFIFigures(options: STATFIOptions) -> list[Figure]:
+    """The selected figures over the selected years, in the order of the STATFI
+    table. Missing values are NaN. Raises FetchError when STATFI cannot be
+    reached.
+    """
+    data = DataFetcher.fetchSTATFIData(options)
+    if isErrorDict(data):
+        raise FetchError(data["error_message"])
+    return FigureFactory.build(data)
+
+
+def fetchSTATFIFiguresBatch(
+    options_list: Sequence[STATFIOptions],
+) -> list[list[Figure]]:
+    """The figures of every options, as fetchSTATFIFigures would return them,
+    from a single query of all the figures and years selected.
+    """
+    figure_names = list(
+        dict.fromkeys(name for options in options_list for name in options.figure_names)
+    )
+    years = sorted(
+        {year for options in options_list for year in options.years}, key=int
+    )
+    if not figure_names or not years:
+        return [[] for _ in options_list]
+    figures = fetchSTATFIFigures(STATFIOptions(figure_names, years))
+
+    results = []
+    for options in options_list:
+        selected_years = np.array([int(year) for year in options.years])
+        selected_figures = []
+        for figure in figures:
+            if figure.getNameValue() not in options.figure_ids:
+                continue
+            is_selected = np.isin(figure.getYearsArray(), selected_years)
+            selected_figure = Figure(
+                figure.getNameValue(),
+                figure.getYearsArray()[is_selected],
+                figure.getValuesArray()[is_selected],
+            )
+            selected_figure.setNameText(figure.getNameText())
+            selected_figures.append(selected_figure)
+        results.append(selected_figures)
+    return results
+
+
+def fetchComparison(
+    options: CompareOptions,
+) -> tuple[list[Figure], list[list[Station]]]:
+    """The STATFI figures and the SMEAR stations of every SMEAR year, in year
+    order, as compared in the comparison tab.
+    """
+    result = ResultBuilder.buildComparisonResult(options)
+    if result.error_message is not None:
+        raise FetchError(result.error_message)
+    return list(result.figures), [
+        list(year_stations) for year_stations in result.stations
+    ]
+
+
+def _getSMEARGroupKey(options: SMEAROptions) -> Hashable:
+    return (
+        options.gas,
+        options.aggregation_method,
+        options.interval,
+        options.start_date_time,
+        options.end_date_time,
+    )
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from model.data_models.figure import Figure
+from model.data_models.station import Station
+from model.data_models.user_options import SMEAROptions
+
+# Results of a fetch, decoded and built in the background so that the GUI thread
+# only has to plot them. They are not modified after being built.
+
+
+@dataclass(frozen=True)
+class SMEARResult:
+    # Options of the request, with the aggregation the stations are plotted in.
+    options: SMEAROptions
+    # Options the data was fetched with, which can be finer than options.
+    source_options: Optional[SMEAROptions] = None
+    source_stations: tuple[Station, ...] = ()
+    stations: tuple[Station, ...] = ()
+    error_message: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class STATFIResult:
+    figures: tuple[Figure, ...] = ()
+    error_message: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ComparisonResult:
+    figures: tuple[Figure, ...] = ()
+    # Stations of every SMEAR year, in year order.
+    stations: tuple[tuple[Station, ...], ...] = ()
+    error_message: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FetchFailure:
+    # Result of a fetch job that raised instead of returning its result.
+    error_message: str
@@ -1,26 +1,42 @@
+from typing import Optional, Sequence, Union
+
 import numpy as np
 
 
 class Figure:
     """Correspond to a STATFI's Tiedo. Each Figure is only one Tiedo,
-    whose data can span multiple years
+    whose data can span multiple years. Years and values are kept as packed
+    arrays, the values usually being a view of the row of the Tiedo in the
+    decoded STATFI data, NaN where missing. The array getters return them as
+    they are, so that they can be plotted without copying.
     """
 
+    __slots__ = ("_nameValue", "_nameText", "_years", "_values")
+
     _nameValue: str
     _nameText: str
-    _yearlyData: dict[int, float]
-
-    def __init__(self, nameValue: str, years: list[int]):
+    _years: np.ndarray
+    _values: np.ndarray
+
+    def __init__(
+        self,
+        nameValue: str,
+        years: Union[Sequence[int], np.ndarray],
+        values: Optional[np.ndarray] = None,
+    ):
         self._nameValue = nameValue
         self._nameText = ""
-        self._yearlyData = {}
-        for year in years:
-            self._yearlyData[year] = np.nan
+        self._years = np.asarray(years, dtype=np.int64)
+        self._values = (
+            np.full(len(self._years), np.nan)
+            if values is None
+            else np.asarray(values, dtype=np.float64)
+        )
 
     def setYearlyData(self, year: int, data: float):
         if not data:
             data = np.nan
-        self._yearlyData[year] = data
+        self._values[np.flatnonzero(self._years == year)] = data
 
     def setNameText(self, nameText: str):
         self._nameText = nameText
@@ -32,7 +48,13 @@ class Figure:
         return self._nameValue
 
     def getYearlyData(self) -> dict[int, float]:
-        return self._yearlyData
+        return dict(zip(self._years.tolist(), self._values.tolist()))
 
     def getYears(self) -> list[int]:
-        return list(self._yearlyData.keys())
+        return self._years.tolist()
+
+    def getYearsArray(self) -> np.ndarray:
+        return self._years
+
+    def getValuesArray(self) -> np.ndarray:
+        return self._values
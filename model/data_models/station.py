@@ -1,35 +1,74 @@
 from datetime import datetime
-from model.utils.consts import ALL_SMEAR_STATIONS  # type: ignore
+from typing import Optional, Sequence, Union
+import numpy as np
+from model.data_models.summary_pyramid import RangeSummary, SummaryPyramid
+from model.utils.consts import SMEAR_VARIABLES_BY_TABLEVARIABLE  # type: ignore
 
 
 class Station:
+    """Timeseries of one SMEAR station variable. Time stamps and concentrations
+    are kept as packed arrays, the list getters are there for callers that still
+    work with Python lists. Range summaries are answered by a SummaryPyramid that
+    is built on first use.
+    """
+
+    __slots__ = ("_station_id", "_concentrations", "_time_stamps", "_pyramid")
+
     _station_id: str
-    _concentrations: list[float]
-    _time_stamps: list[datetime]
+    _concentrations: np.ndarray
+    _time_stamps: np.ndarray
+    _pyramid: Optional[SummaryPyramid]
 
-    def __init__(self, station_id: str):
+    def __init__(self, station_id: str, concentration_dtype=np.float64):
         self._station_id = station_id
-        self._concentrations = []
-        self._time_stamps = []
+        self._concentrations = np.array([], dtype=concentration_dtype)
+        self._time_stamps = np.array([], dtype="datetime64[ns]")
+        self._pyramid = None
 
-    def setConcentrations(self, concentrations: list[float]):
-        self._concentrations = concentrations
+    def setConcentrations(self, concentrations: Union[Sequence[float], np.ndarray]):
+        self._concentrations = np.asarray(
+            concentrations, dtype=self._concentrations.dtype
+        )
+        self._pyramid = None
 
-    def setTimeStamps(self, time_stamps: list[datetime]):
-        self._time_stamps = time_stamps
+    def setTimeStamps(self, time_stamps: Union[Sequence[datetime], np.ndarray]):
+        self._time_stamps = np.asarray(time_stamps, dtype="datetime64[ns]")
+        self._pyramid = None
 
     def getIdentifier(self) -> str:
         return self._station_id
 
     def getName(self) -> str:
-        for station_name in ALL_SMEAR_STATIONS:
-            for gas_info in ALL_SMEAR_STATIONS[station_name].values():
-                if self._station_id == f"{gas_info['table']}.{gas_info['variable']}":
-                    return station_name
-        raise Exception(f"No station name found for id {self._station_id}")
+        if self._station_id not in SMEAR_VARIABLES_BY_TABLEVARIABLE:
+            raise Exception(f"No station name found for id {self._station_id}")
+        return SMEAR_VARIABLES_BY_TABLEVARIABLE[self._station_id].station
 
     def getTimeStamps(self) -> list[datetime]:
-        return self._time_stamps
+        return self._time_stamps.astype("datetime64[us]").tolist()
 
     def getConcentrations(self) -> list[float]:
+        return self._concentrations.tolist()
+
+    def getTimeStampsArray(self) -> np.ndarray:
+        return self._time_stamps
+
+    def getConcentrationsArray(self) -> np.ndarray:
         return self._concentrations
+
+    def hasData(self) -> bool:
+        return len(self._concentrations) > 0
+
+    def getSummaryPyramid(self) -> SummaryPyramid:
+        if self._pyramid is None:
+            self._pyramid = SummaryPyramid(self._time_stamps, self._concentrations)
+        return self._pyramid
+
+    def getSummary(
+        self,
+        start: Optional[np.datetime64] = None,
+        end: Optional[np.datetime64] = None,
+    ) -> RangeSummary:
+        """Min, max, sum and count of the concentrations with time stamps in
+        [start, end), of all of them by default.
+        """
+        return self.getSummaryPyramid().getTimeRangeSummary(start, end)
@@ -0,0 +1,295 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Samples summarised by one block of the lowest level. Each level above halves
+# the number of blocks.
+_BLOCK_SIZE = 64
+
+
+class RangeSummary(NamedTuple):
+    minimum: float
+    maximum: float
+    sum: float
+    count: int
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else np.nan
+
+
+class _Level(NamedTuple):
+    # Per block: min and max with the sample indices they are at, sum and count.
+    minimums: np.ndarray
+    minimum_indices: np.ndarray
+    maximums: np.ndarray
+    maximum_indices: np.ndarray
+    sums: np.ndarray
+    counts: np.ndarray
+
+
+class SummaryPyramid:
+    """Min, max, sum and count of a series precomputed for blocks of samples at
+    halving resolutions, like a segment tree. The summary of any range of
+    samples combines O(log n) blocks and at most two partial blocks of raw
+    samples, so min/max envelopes at screen resolution are found without
+    scanning the series.
+    """
+
+    _time_stamps: np.ndarray
+    _values: np.ndarray
+    _levels: list[_Level]
+
+    def __init__(self, time_stamps: np.ndarray, values: np.ndarray):
+        self._time_stamps = time_stamps
+        self._values = values
+        self._levels = []
+        if len(values) >= _BLOCK_SIZE:
+            self._levels.append(self._buildLowestLevel(values))
+            while len(self._levels[-1].counts) > 1:
+                self._levels.append(self._buildParentLevel(self._levels[-1]))
+
+    def getRangeSummary(self, start_index: int, end_index: int) -> RangeSummary:
+        """Summary of the samples in [start_index, end_index)."""
+        start_index = max(start_index, 0)
+        end_index = min(end_index, len(self._values))
+        if start_index >= end_index:
+            return RangeSummary(np.nan, np.nan, 0.0, 0)
+
+        first_block = -(-start_index // _BLOCK_SIZE)
+        last_block = end_index // _BLOCK_SIZE
+        if not self._levels or first_block >= last_block:
+            return self._summariseSamples(start_index, end_index)
+
+        parts = [
+            self._summariseSamples(start_index, first_block * _BLOCK_SIZE),
+            self._summariseSamples(last_block * _BLOCK_SIZE, end_index),
+        ]
+        # Walks up the levels, taking the blocks at the edges of the range that
+        # have no parent fully inside it.
+        low, high = first_block, last_block
+        for level in self._levels:
+            if low >= high:
+                break
+            if low % 2:
+                parts.append(self._summariseBlock(level, low))
+                low += 1
+            if high % 2:
+                high -= 1
+                parts.append(self._summariseBlock(level, high))
+            low //= 2
+            high //= 2
+        return self._combine(parts)
+
+    def getTimeRangeSummary(
+        self, start: Optional[np.datetime64], end: Optional[np.datetime64]
+    ) -> RangeSummary:
+        """Summary of the samples with time stamps in [start, end), where a
+        missing bound means the start or the end of the series.
+        """
+        return self.getRangeSummary(*self._getTimeRangeIndices(start, end))
+
+    def getEnvelopeIndices(self, column_count: int) -> np.ndarray:
+        """Indices of the minimum and maximum sample of each of column_count equal
+        time columns over the series, plus the first and last sample. The range of
+        every column is looked up like in getRangeSummary, for all columns at once.
+        """
+        sample_count = len(self._values)
+        if sample_count <= 2 * column_count or column_count < 1:
+            return np.arange(sample_count)
+
+        time_stamps = self._time_stamps.view(np.int64)
+        column_edges = np.linspace(
+            time_stamps[0], time_stamps[-1], column_count + 1
+        ).astype(np.int64)
+        starts = np.searchsorted(time_stamps, column_edges[:-1])
+        ends = np.append(starts[1:], sample_count)
+        is_not_empty = starts < ends
+        starts, ends = starts[is_not_empty], ends[is_not_empty]
+
+        first_blocks = -(-starts // _BLOCK_SIZE)
+        last_blocks = np.maximum(ends // _BLOCK_SIZE, first_blocks)
+        if not self._levels:
+            last_blocks = first_blocks = ends
+        raw_starts = np.concatenate(
+            [starts, np.maximum(last_blocks * _BLOCK_SIZE, starts)]
+        )
+        raw_ends = np.concatenate([np.minimum(first_blocks * _BLOCK_SIZE, ends), ends])
+        columns = np.arange(len(starts))
+        raw_indices, raw_columns = self._expandRanges(
+            raw_starts, raw_ends, np.tile(columns, 2)
+        )
+        candidates = [
+            (
+                raw_columns,
+                self._values[raw_indices],
+                raw_indices,
+                self._values[raw_indices],
+                raw_indices,
+            )
+        ]
+
+        low, high = first_blocks, last_blocks
+        for level in self._levels:
+            is_active = low < high
+            if not is_active.any():
+                break
+            for blocks, is_taken in (
+                (low, is_active & (low % 2 == 1)),
+                (high - 1, is_active & (high % 2 == 1)),
+            ):
+                taken_blocks = blocks[is_taken]
+                candidates.append(
+                    (
+                        columns[is_taken],
+                        level.minimums[taken_blocks],
+                        level.minimum_indices[taken_blocks],
+                        level.maximums[taken_blocks],
+                        level.maximum_indices[taken_blocks],
+                    )
+                )
+            low = (low + (is_active & (low % 2 == 1))) // 2
+            high = (high - (is_active & (high % 2 == 1))) // 2
+
+        (
+            candidate_columns,
+            minimums,
+            minimum_indices,
+            maximums,
+            maximum_indices,
+        ) = (np.concatenate(parts) for parts in zip(*candidates))
+        return np.unique(
+            np.concatenate(
+                [
+                    self._getExtremeIndices(
+                        candidate_columns, minimums, minimum_indices, np.minimum
+                    ),
+                    self._getExtremeIndices(
+                        candidate_columns, maximums, maximum_indices, np.maximum
+                    ),
+                    [0, sample_count - 1],
+                ]
+            )
+        )
+
+    def _getExtremeIndices(
+        self,
+        columns: np.ndarray,
+        values: np.ndarray,
+        indices: np.ndarray,
+        extreme: np.ufunc,
+    ) -> np.ndarray:
+        # The sample index of the extreme value of each column.
+        column_extremes = np.full(columns.max() + 1, np.nan)
+        order = np.argsort(columns, kind="stable")
+        columns, values, indices = columns[order], values[order], indices[order]
+        starts = np.flatnonzero(np.diff(columns, prepend=-1))
+        column_extremes[columns[starts]] = extreme.reduceat(values, starts)
+        is_extreme = values == column_extremes[columns]
+        _, first_extremes = np.unique(columns[is_extreme], return_index=True)
+        return indices[is_extreme][first_extremes]
+
+    def _expandRanges(
+        self, starts: np.ndarray, ends: np.ndarray, labels: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # All indices of the [start, end) ranges with the label of their range.
+        lengths = np.maximum(ends - starts, 0)
+        range_of_index = np.repeat(np.arange(len(starts)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return starts[range_of_index] + offsets, labels[range_of_index]
+
+    def _getTimeRangeIndices(
+        self, start: Optional[np.datetime64], end: Optional[np.datetime64]
+    ) -> tuple[int, int]:
+        return (
+            0 if start is None else int(np.searchsorted(self._time_stamps, start)),
+            (
+                len(self._time_stamps)
+                if end is None
+                else int(np.searchsorted(self._time_stamps, end))
+            ),
+        )
+
+    def _summariseSamples(self, start_index: int, end_index: int) -> RangeSummary:
+        if start_index >= end_index:
+            return RangeSummary(np.nan, np.nan, 0.0, 0)
+        values = self._values[start_index:end_index]
+        return RangeSummary(
+            float(values.min()),
+            float(values.max()),
+            float(values.sum()),
+            end_index - start_index,
+        )
+
+    def _summariseBlock(self, level: _Level, block: int) -> RangeSummary:
+        return RangeSummary(
+            float(level.minimums[block]),
+            float(level.maximums[block]),
+            float(level.sums[block]),
+            int(level.counts[block]),
+        )
+
+    def _combine(self, parts: list[RangeSummary]) -> RangeSummary:
+        parts = [part for part in parts if part.count]
+        return RangeSummary(
+            min(part.minimum for part in parts),
+            max(part.maximum for part in parts),
+            sum(part.sum for part in parts),
+            sum(part.count for part in parts),
+        )
+
+    def _buildLowestLevel(self, values: np.ndarray) -> _Level:
+        # Only whole blocks, the samples after the last one are read raw.
+        block_count = len(values) // _BLOCK_SIZE
+        blocks = values[: block_count * _BLOCK_SIZE].reshape(block_count, _BLOCK_SIZE)
+        offsets = np.arange(block_count) * _BLOCK_SIZE
+        minimum_indices = offsets + blocks.argmin(axis=1)
+        maximum_indices = offsets + blocks.argmax(axis=1)
+        return _Level(
+            values[minimum_indices],
+            minimum_indices,
+            values[maximum_indices],
+            maximum_indices,
+            blocks.sum(axis=1),
+            np.full(block_count, _BLOCK_SIZE, dtype=np.int64),
+        )
+
+    def _buildParentLevel(self, level: _Level) -> _Level:
+        # Pairs of blocks are merged, an odd last block is carried over as is.
+        pair_count = len(level.counts) // 2
+        left = slice(0, 2 * pair_count, 2)
+        right = slice(1, 2 * pair_count, 2)
+        rest = slice(2 * pair_count, None)
+
+        is_left_minimum = level.minimums[left] <= level.minimums[right]
+        is_left_maximum = level.maximums[left] >= level.maximums[right]
+        return _Level(
+            np.append(
+                np.minimum(level.minimums[left], level.minimums[right]),
+                level.minimums[rest],
+            ),
+            np.append(
+                np.where(
+                    is_left_minimum,
+                    level.minimum_indices[left],
+                    level.minimum_indices[right],
+                ),
+                level.minimum_indices[rest],
+            ),
+            np.append(
+                np.maximum(level.maximums[left], level.maximums[right]),
+                level.maximums[rest],
+            ),
+            np.append(
+                np.where(
+                    is_left_maximum,
+                    level.maximum_indices[left],
+                    level.maximum_indices[right],
+                ),
+                level.maximum_indices[rest],
+            ),
+            np.append(level.sums[left] + level.sums[right], level.sums[rest]),
+            np.append(level.counts[left] + level.counts[right], level.counts[rest]),
+        )
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import ClassVar
+from typing import ClassVar, Iterable, Union
 
-from model.utils.consts import ALL_SMEAR_STATIONS, ALL_STATFI_LABELS  # type: ignore
+from model.utils.consts import ALL_STATFI_LABELS, SMEAR_VARIABLES_BY_STATION  # type: ignore
 
 
 class SMEARGas(Enum):
@@ -19,6 +19,14 @@ class SMEARAggregation(Enum):
     AVG = "ARITHMETIC"
 
 
+class DownsamplingMethod(Enum):
+    NONE = "NONE"
+    # Largest-triangle-three-buckets.
+    LTTB = "LTTB"
+    # Minimum and maximum of every pixel column.
+    MIN_MAX = "MIN_MAX"
+
+
 class STATFIPlotType(Enum):
     LINE_GRAPH = "LINE"
     BAR_CHART = "BAR"
@@ -46,10 +54,10 @@ class SMEAROptions:
         ]
 
     def _getTableName(self, station_name: str):
-        return ALL_SMEAR_STATIONS[station_name][self.gas.value]["table"]
+        return SMEAR_VARIABLES_BY_STATION[(station_name, self.gas.value)].table
 
     def _getVariableName(self, station_name: str):
-        return ALL_SMEAR_STATIONS[station_name][self.gas.value]["variable"]
+        return SMEAR_VARIABLES_BY_STATION[(station_name, self.gas.value)].variable
 
 
 @dataclass
@@ -65,6 +73,21 @@ class STATFIOptions:
         ]
 
 
+def isBreakdownComparison(
+    STATFI_years: Iterable[Union[int, str]], SMEAR_years: Iterable[Union[int, str]]
+) -> bool:
+    # The SMEAR data of each year is drawn in full under the STATFI value of the
+    # year when both cover the same consecutive years. Otherwise only the yearly
+    # averages are compared, which do not need detailed data. Used both to
+    # choose the data fetched and to choose the view it is plotted in.
+    sorted_STATFI_years = sorted(int(year) for year in STATFI_years)
+    sorted_SMEAR_years = sorted(int(year) for year in SMEAR_years)
+    return sorted_STATFI_years == sorted_SMEAR_years and all(
+        next_year - year == 1
+        for year, next_year in zip(sorted_SMEAR_years, sorted_SMEAR_years[1:])
+    )
+
+
 @dataclass
 class CompareOptions:
     STATFI_figure_names: list[str]
@@ -74,6 +97,9 @@ class CompareOptions:
     SMEAR_stations: list[str]
     SMEAR_years: list[str]
 
+    def isBreakdown(self) -> bool:
+        return isBreakdownComparison(self.STATFI_years, self.SMEAR_years)
+
 
 @dataclass
 class AllTabsOptions:
@@ -86,6 +112,7 @@ class AllTabsOptions:
 class SMEARPlotOptions:
     gas: SMEARGas
     aggregation_method: SMEARAggregation
+    downsampling_method: DownsamplingMethod = DownsamplingMethod.MIN_MAX
 
 
 @dataclass
@@ -96,3 +123,4 @@ class STATFIPlotOptions:
 @dataclass
 class ComparePlotOptions:
     gas: SMEARGas
+    downsampling_method: DownsamplingMethod = DownsamplingMethod.MIN_MAX
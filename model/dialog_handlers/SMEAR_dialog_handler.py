@@ -1,4 +1,5 @@
-from datetime import date, datetime
+from datetime import date
+from typing import Optional
 
 import numpy as np
 from model.data_models.station import Station
@@ -71,9 +72,7 @@ class SMEARDialogHandler:
         data: dict[str, list[float]] = {}
         for station in self._stations:
             try:
-                data[station.getName()] = self._getAggregatedConcentration(
-                    station.getConcentrations()
-                )
+                data[station.getName()] = self._getAggregatedConcentration(station)
             except ValueError:
                 data[station.getName()] = [np.nan] * 3
         return data
@@ -138,10 +137,8 @@ class SMEARDialogHandler:
         missing_data_station_names: list[str] = []
         for station in chosen_stations:
             try:
-                daily_aggregations[
-                    station.getName()
-                ] = self._getAggregatedConcentration(
-                    self._getConcentrationsInDate(station, chosen_date)
+                daily_aggregations[station.getName()] = self._getDailyAggregation(
+                    station, chosen_date
                 )
             except ValueError:
                 missing_data_station_names.append(station.getName())
@@ -161,36 +158,21 @@ class SMEARDialogHandler:
 
         return daily_min, daily_max, daily_avg, daily_min_station, daily_max_station
 
-    def _getConcentrationsInDate(
-        self, station: Station, chosen_date: date
-    ) -> list[float]:
-        start_datetime: datetime = datetime(
-            chosen_date.year, chosen_date.month, chosen_date.day, 0, 0, 0
-        )
-        end_datetime: datetime = datetime(
-            chosen_date.year, chosen_date.month, chosen_date.day, 23, 59, 59
-        )
-        timestamps = station.getTimeStamps()
-        timestamps_in_date_indices: list[int] = []
-        for timestamp_index, timestamp in enumerate(timestamps):
-            if start_datetime <= timestamp <= end_datetime:
-                timestamps_in_date_indices.append(timestamp_index)
-        try:
-            concentrations_in_date = station.getConcentrations()[
-                timestamps_in_date_indices[0] : timestamps_in_date_indices[-1] + 1
-            ]
-            return concentrations_in_date
-        except IndexError:
-            return []
+    def _getDailyAggregation(self, station: Station, chosen_date: date) -> list[float]:
+        day = np.datetime64(chosen_date, "D")
+        return self._getAggregatedConcentration(station, day, day + 1)
 
-    def _getAggregatedConcentration(self, concentrations: list[float]) -> list[float]:
-        if not concentrations:
+    def _getAggregatedConcentration(
+        self,
+        station: Station,
+        start: Optional[np.datetime64] = None,
+        end: Optional[np.datetime64] = None,
+    ) -> list[float]:
+        # Answered by the summary pyramid of the station, without a scan.
+        summary = station.getSummary(start, end)
+        if summary.count == 0:
             raise ValueError("No data to aggregate")
-        return [
-            np.min(concentrations),
-            np.max(concentrations),
-            np.mean(concentrations),
-        ]
+        return [summary.minimum, summary.maximum, summary.mean]
 
     def _handleMissingDailyData(self, missing_data_station_names: list[str]):
         self._disableMissingStations(missing_data_station_names)
@@ -1,29 +1,34 @@
-from typing import Any
+from typing import Any, Union
+import numpy as np
 from model.factories.factory import Factory  # type: ignore
 from model.data_models.figure import Figure
+from model.utils.json_stat_decoder import (  # type: ignore
+    JSONStatCube,
+    decodeJSONStat,
+)
 
 
 class FigureFactory(Factory):
     @staticmethod
-    def build(data: dict[str, Any]) -> list[Figure]:
+    def build(data: Union[dict[str, Any], JSONStatCube]) -> list[Figure]:
+        # A json-stat2 response is decoded first, a slice of the STATFI snapshot
+        # is already a cube.
         try:
-            figure_index_dict = data["dimension"]["Tiedot"]["category"]["index"]
-            figure_name_text_dict = data["dimension"]["Tiedot"]["category"]["label"]
-            year_index_dict = data["dimension"]["Vuosi"]["category"]["index"]
-            years_int = [int(year) for year in year_index_dict.keys()]
-            yearly_values_list = [
-                data["value"][i : i + len(years_int)]
-                for i in range(0, len(data["value"]), len(years_int))
-            ]
-            figures = []
-            for figure_name_value, figure_index in figure_index_dict.items():
-                figure = Figure(nameValue=figure_name_value, years=years_int)
-                figure.setNameText(figure_name_text_dict[figure_name_value])
-                for year_string, year_index in year_index_dict.items():
-                    figure.setYearlyData(
-                        int(year_string), yearly_values_list[figure_index][year_index]
-                    )
-                figures.append(figure)
-            return figures
-        except KeyError:
+            if not isinstance(data, JSONStatCube):
+                data = decodeJSONStat(data)
+            cube = data.transpose(["Tiedot", "Vuosi"])
+        except (KeyError, ValueError, TypeError):
             return []
+        figure_dimension, year_dimension = cube.dimensions
+        years = np.array([int(year) for year in year_dimension.ids], dtype=np.int64)
+        # Zeros count as missing, as they always have for STATFI figures.
+        values = cube.values
+        values[values == 0] = np.nan
+        figures = []
+        for figure_index, (figure_name_value, figure_name_text) in enumerate(
+            zip(figure_dimension.ids, figure_dimension.labels)
+        ):
+            figure = Figure(figure_name_value, years, values[figure_index])
+            figure.setNameText(figure_name_text)
+            figures.append(figure)
+        return figures
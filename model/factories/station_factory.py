@@ -1,5 +1,6 @@
-from datetime import datetime
+from operator import itemgetter
 from typing import Any
+import numpy as np
 from model.factories.factory import Factory  # type: ignore
 from model.data_models.station import Station
 
@@ -7,26 +8,51 @@ from model.data_models.station import Station
 class StationFactory(Factory):
     @staticmethod
     def build(data: dict[str, Any]) -> list[Station]:
-        stations = []
-        datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
         try:
-            station_ids = data["columns"]
-            for station_id in station_ids:
-                station = Station(station_id)
-                timestamps = []
-                concentrations = []
-                for concentration_data in data["data"]:
-                    concentration: float = concentration_data[station_id]
-                    if concentration is not None:
-                        timestamps.append(
-                            datetime.strptime(
-                                concentration_data["samptime"], datetime_format
-                            )
-                        )
-                        concentrations.append(concentration)
-                station.setTimeStamps(timestamps)
-                station.setConcentrations(concentrations)
-                stations.append(station)
-            return stations
+            # Columnar data decoded from a streamed SMEAR response.
+            if "values" in data:
+                return StationFactory._buildFromColumns(
+                    data["columns"], data["samptimes"], data["values"]
+                )
+            return StationFactory._buildFromRows(data["columns"], data["data"])
         except KeyError:
-            return stations
+            return []
+
+    @staticmethod
+    def _buildFromRows(
+        station_ids: list[str], rows: list[dict[str, Any]]
+    ) -> list[Station]:
+        if not station_ids:
+            return []
+        # The shared samptime column is parsed once for all stations, and all
+        # station columns are read in the same pass over the rows. None becomes NaN.
+        samptimes = np.array([row["samptime"] for row in rows], dtype="datetime64[ms]")
+        get_values = itemgetter(*station_ids)
+        values = np.array([get_values(row) for row in rows], dtype=np.float64).reshape(
+            len(rows), len(station_ids)
+        )
+        return StationFactory._buildFromColumns(
+            station_ids,
+            samptimes,
+            {
+                station_id: values[:, column_index]
+                for column_index, station_id in enumerate(station_ids)
+            },
+        )
+
+    @staticmethod
+    def _buildFromColumns(
+        station_ids: list[str],
+        samptimes: np.ndarray,
+        values: dict[str, np.ndarray],
+    ) -> list[Station]:
+        stations = []
+        samptimes = samptimes.astype("datetime64[ns]")
+        for station_id in station_ids:
+            station = Station(station_id)
+            station_values = values[station_id]
+            is_available = ~np.isnan(station_values)
+            station.setTimeStamps(samptimes[is_available])
+            station.setConcentrations(station_values[is_available])
+            stations.append(station)
+        return stations
@@ -1,18 +1,9 @@
 import json
-from dataclasses import asdict
 from datetime import datetime
-from typing import Any
 from PyQt6.QtWidgets import QMainWindow
 
-from model.data_models.user_options import (
-    AllTabsOptions,
-    CompareOptions,
-    SMEARAggregation,
-    SMEARGas,
-    SMEAROptions,
-    STATFIOptions,
-    STATFIPlotType,
-)
+from model.data_models.user_options import AllTabsOptions
+from model.options_parser.options_serializer import OptionsSerializer
 from model.utils.consts import OPTIONS_DIRECTORY  # type: ignore
 from model.utils.file_manager import newFile, openFile  # type: ignore
 
@@ -55,89 +46,18 @@ class OptionsParser:
         )
         if not file_name:
             return
-        with open(file_name, "r", encoding="utf-8") as json_file:
-            try:
-                options_dict = json.load(json_file)
-                options = self._dictToAllTabsOptions(options_dict)
-                self._setTabsUIOptions(options)
-                self._window.getTabHandler("SMEAR").fetchAndVisualise()
-                self._window.getTabHandler("STATFI").fetchAndVisualise()
-                self._window.getTabHandler("compare").fetchAndVisualise()
-            except json.decoder.JSONDecodeError:
-                raise ValueError(f"Could not parse JSON in {file_name}")
+        options = OptionsSerializer.loadOptionsFile(file_name)
+        # Hidden tabs only fetch their data once they are shown.
+        self._window.setTabOptions("SMEAR", options.SMEAR)  # type: ignore
+        self._window.setTabOptions("STATFI", options.STATFI)  # type: ignore
+        self._window.setTabOptions("compare", options.compare)  # type: ignore
 
     def _getAllTabOptionsDict(self):
-        options_dict = self._allTabsOptionsToDict(
+        options_dict = OptionsSerializer.allTabsOptionsToDict(
             AllTabsOptions(
-                SMEAR=self._window._SMEAR_tab_handler.getUIOptions(),
-                STATFI=self._window._STATFI_tab_handler.getUIOptions(),
-                compare=self._window._compare_tab_handler.getUIOptions(),
+                SMEAR=self._window.getTabOptions("SMEAR"),  # type: ignore
+                STATFI=self._window.getTabOptions("STATFI"),  # type: ignore
+                compare=self._window.getTabOptions("compare"),  # type: ignore
             )
         )
         return options_dict
-
-    def _allTabsOptionsToDict(self, options: AllTabsOptions) -> dict[str, Any]:
-        return {
-            "SMEAR": self._SMEAROptionsToDict(options.SMEAR),
-            "STATFI": self._STATFIOptionsToDict(options.STATFI),
-            "compare": self._CompareOptionsToDict(options.compare),
-        }
-
-    def _SMEAROptionsToDict(self, options: SMEAROptions) -> dict[str, Any]:
-        SMEAR_options_dict = asdict(options)
-        SMEAR_options_dict["gas"] = SMEAR_options_dict["gas"].name
-        SMEAR_options_dict["aggregation_method"] = SMEAR_options_dict[
-            "aggregation_method"
-        ].name
-        return SMEAR_options_dict
-
-    def _STATFIOptionsToDict(self, options: STATFIOptions) -> dict[str, Any]:
-        STATFI_options_dict = asdict(options)
-        STATFI_options_dict["plot_type"] = STATFI_options_dict["plot_type"].name
-        return STATFI_options_dict
-
-    def _CompareOptionsToDict(self, options: CompareOptions) -> dict[str, Any]:
-        compare_options_dict = asdict(options)
-        compare_options_dict["SMEAR_gas"] = compare_options_dict["SMEAR_gas"].name
-        return compare_options_dict
-
-    def _dictToAllTabsOptions(self, options: dict[str, Any]):
-        return AllTabsOptions(
-            SMEAR=self._dictToSMEAROptions(options["SMEAR"]),
-            STATFI=self._dictToSTATFIOptions(options["STATFI"]),
-            compare=self._dictToCompareOptions(options["compare"]),
-        )
-
-    def _dictToSMEAROptions(self, SMEAR_options_dict: dict[str, Any]) -> SMEAROptions:
-        SMEAR_time_format = "%Y-%m-%d %H:%M:%S"
-
-        SMEAR_options_dict["gas"] = SMEARGas[SMEAR_options_dict["gas"]]
-        SMEAR_options_dict["aggregation_method"] = SMEARAggregation[
-            SMEAR_options_dict["aggregation_method"]
-        ]
-        SMEAR_options_dict["start_date_time"] = datetime.strptime(
-            SMEAR_options_dict["start_date_time"], SMEAR_time_format
-        )
-        SMEAR_options_dict["end_date_time"] = datetime.strptime(
-            SMEAR_options_dict["end_date_time"], SMEAR_time_format
-        )
-        return SMEAROptions(**SMEAR_options_dict)
-
-    def _dictToSTATFIOptions(
-        self, STATFI_options_dict: dict[str, Any]
-    ) -> STATFIOptions:
-        STATFI_options_dict["plot_type"] = STATFIPlotType[
-            STATFI_options_dict["plot_type"]
-        ]
-        return STATFIOptions(**STATFI_options_dict)
-
-    def _dictToCompareOptions(
-        self, compare_options_dict: dict[str, Any]
-    ) -> CompareOptions:
-        compare_options_dict["SMEAR_gas"] = SMEARGas[compare_options_dict["SMEAR_gas"]]
-        return CompareOptions(**compare_options_dict)
-
-    def _setTabsUIOptions(self, options: AllTabsOptions):
-        self._window._SMEAR_tab_handler.setUIOptions(options.SMEAR)  # type: ignore
-        self._window._STATFI_tab_handler.setUIOptions(options.STATFI)  # type: ignore
-        self._window._compare_tab_handler.setUIOptions(options.compare)  # type: ignore
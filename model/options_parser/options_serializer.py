@@ -0,0 +1,94 @@
+import json
+from datetime import datetime
+from dataclasses import asdict
+from typing import Any
+
+from model.data_models.user_options import (
+    AllTabsOptions,
+    CompareOptions,
+    SMEARAggregation,
+    SMEARGas,
+    SMEAROptions,
+    STATFIOptions,
+    STATFIPlotType,
+)
+
+
+class OptionsSerializer:
+    """Converts the options of all tabs to and from the dicts of the exported
+    JSON files, without needing the window.
+    """
+
+    @staticmethod
+    def loadOptionsFile(file_name: str) -> AllTabsOptions:
+        with open(file_name, "r", encoding="utf-8") as json_file:
+            try:
+                options_dict = json.load(json_file)
+            except json.decoder.JSONDecodeError:
+                raise ValueError(f"Could not parse JSON in {file_name}")
+        return OptionsSerializer.dictToAllTabsOptions(options_dict)
+
+    @staticmethod
+    def allTabsOptionsToDict(options: AllTabsOptions) -> dict[str, Any]:
+        return {
+            "SMEAR": OptionsSerializer.SMEAROptionsToDict(options.SMEAR),
+            "STATFI": OptionsSerializer.STATFIOptionsToDict(options.STATFI),
+            "compare": OptionsSerializer.CompareOptionsToDict(options.compare),
+        }
+
+    @staticmethod
+    def SMEAROptionsToDict(options: SMEAROptions) -> dict[str, Any]:
+        SMEAR_options_dict = asdict(options)
+        SMEAR_options_dict["gas"] = SMEAR_options_dict["gas"].name
+        SMEAR_options_dict["aggregation_method"] = SMEAR_options_dict[
+            "aggregation_method"
+        ].name
+        return SMEAR_options_dict
+
+    @staticmethod
+    def STATFIOptionsToDict(options: STATFIOptions) -> dict[str, Any]:
+        STATFI_options_dict = asdict(options)
+        STATFI_options_dict["plot_type"] = STATFI_options_dict["plot_type"].name
+        return STATFI_options_dict
+
+    @staticmethod
+    def CompareOptionsToDict(options: CompareOptions) -> dict[str, Any]:
+        compare_options_dict = asdict(options)
+        compare_options_dict["SMEAR_gas"] = compare_options_dict["SMEAR_gas"].name
+        return compare_options_dict
+
+    @staticmethod
+    def dictToAllTabsOptions(options: dict[str, Any]):
+        return AllTabsOptions(
+            SMEAR=OptionsSerializer.dictToSMEAROptions(options["SMEAR"]),
+            STATFI=OptionsSerializer.dictToSTATFIOptions(options["STATFI"]),
+            compare=OptionsSerializer.dictToCompareOptions(options["compare"]),
+        )
+
+    @staticmethod
+    def dictToSMEAROptions(SMEAR_options_dict: dict[str, Any]) -> SMEAROptions:
+        SMEAR_time_format = "%Y-%m-%d %H:%M:%S"
+
+        SMEAR_options_dict["gas"] = SMEARGas[SMEAR_options_dict["gas"]]
+        SMEAR_options_dict["aggregation_method"] = SMEARAggregation[
+            SMEAR_options_dict["aggregation_method"]
+        ]
+        SMEAR_options_dict["start_date_time"] = datetime.strptime(
+            SMEAR_options_dict["start_date_time"], SMEAR_time_format
+        )
+        SMEAR_options_dict["end_date_time"] = datetime.strptime(
+            SMEAR_options_dict["end_date_time"], SMEAR_time_format
+        )
+        return SMEAROptions(**SMEAR_options_dict)
+
+    @staticmethod
+    def dictToSTATFIOptions(STATFI_options_dict: dict[str, Any]) -> STATFIOptions:
+        STATFI_options_dict["plot_type"] = STATFIPlotType[
+            STATFI_options_dict["plot_type"]
+        ]
+        return STATFIOptions(**STATFI_options_dict)
+
+    @staticmethod
+    def dictToCompareOptions(compare_options_dict: dict[str, Any]) -> CompareOptions:
+        compare_options_dict["SMEAR_gas"] = SMEARGas[compare_options_dict["SMEAR_gas"]]
+        return CompareOptions(**compare_options_dict)
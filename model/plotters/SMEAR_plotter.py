@@ -1,25 +1,50 @@
-import datetime
+from datetime import datetime
+from typing import Callable, Optional
 import matplotlib.dates as mdates  # type: ignore
+import numpy as np
 from model.data_models.station import Station
-from model.data_models.user_options import SMEARAggregation, SMEARPlotOptions
-from model.plotters.plotter import Plotter
-from ui.mplwidget import MplWidget
+from model.data_models.user_options import (
+    DownsamplingMethod,
+    SMEARAggregation,
+    SMEARPlotOptions,
+)
+from model.plotters.plotter import Plotter, PlotWidget
+from model.plotters.retained_lines import LineData, RetainedLines
+from model.utils.downsampler import downsampleStation  # type: ignore
 
 
 class SMEARPlotter(Plotter):
-    _plot: MplWidget
+    _plot: PlotWidget
+    _lines: RetainedLines
+    _visible_range_callback: Optional[Callable[[], None]] = None
 
-    def __init__(self, plot: MplWidget):
+    def __init__(self, plot: PlotWidget):
         self._plot = plot
+        self._lines = RetainedLines(self._plot.canvas.ax)
 
-    def plotData(self, data: list[Station], options: SMEARPlotOptions):
-        self._plot.canvas.ax.clear()
-        for station in data:
-            if self._isStationDataAvailable(station):
-                gas_timestamps = station.getTimeStamps()
-                gas_values = station.getConcentrations()
-                station_name = station.getName()
-                self._plotStationLine(gas_timestamps, gas_values, station_name)
+    def plotData(
+        self,
+        data: list[Station],
+        options: SMEARPlotOptions,
+        keep_view_limits: bool = False,
+    ):
+        """Plot the stations, fitting the view to them unless keep_view_limits is
+        set, e.g. when finer data of the zoomed in range replaces the data shown.
+        """
+        self._removeEmptyText()
+        if not keep_view_limits:
+            # New data starts a new zoom history of the toolbar.
+            self._plot.toolbar.update()
+        is_changed = self._lines.update(
+            {
+                station.getIdentifier(): self._getStationLine(
+                    station, options.downsampling_method, keep_view_limits
+                )
+                for station in data
+                if self._isStationDataAvailable(station)
+            },
+            rescale=not keep_view_limits,
+        )
 
         aggregation_string = self._getAggregationString(options)
         self._plot.canvas.ax.set_xlabel("Timestamps")
@@ -29,6 +54,13 @@ class SMEARPlotter(Plotter):
         self._plot.canvas.ax.set_title(
             f"{aggregation_string} {options.gas.name} concentration between stations"
         )
+        # The legend and the layout only have to be redone when lines were
+        # added, removed or restyled.
+        if is_changed:
+            self._designCanvas()
+        self._plot.canvas.draw_idle()
+
+    def _designCanvas(self):
         self._plot.canvas.ax.tick_params(
             axis="x",
             which="both",
@@ -42,23 +74,65 @@ class SMEARPlotter(Plotter):
         )
         self._plot.canvas.ax.legend(loc="best", fontsize="x-small")
         self._plot.canvas.fig.tight_layout()
-        self._plot.canvas.draw()
 
-    def _plotStationLine(
+    def getVisibleRange(self) -> tuple[datetime, datetime]:
+        start, end = self._plot.canvas.ax.get_xlim()
+        return (
+            mdates.num2date(start).replace(tzinfo=None),
+            mdates.num2date(end).replace(tzinfo=None),
+        )
+
+    def setVisibleRangeCallback(self, callback: Callable[[], None]):
+        # Called whenever the x range changes, by zooming and panning as well as
+        # by plotting new data.
+        self._visible_range_callback = callback
+        self._connectVisibleRangeCallback()
+
+    def _connectVisibleRangeCallback(self):
+        if self._visible_range_callback is not None:
+            callback = self._visible_range_callback
+            self._plot.canvas.ax.callbacks.connect(
+                "xlim_changed", lambda _ax: callback()
+            )
+
+    def _clearPlot(self):
+        super()._clearPlot()
+        self._lines.forget()
+        # Clearing the axes also disconnects its callbacks.
+        self._connectVisibleRangeCallback()
+
+    def _getStationLine(
         self,
-        timestamps: list[datetime.datetime],
-        values: list[float],
-        station_name: str,
+        station: Station,
+        downsampling_method: DownsamplingMethod,
+        keep_view_limits: bool = False,
         max_marker_num: int = 20,
-    ):
-        self._plot.canvas.ax.plot(
+    ) -> LineData:
+        timestamps, values = downsampleStation(
+            station,
+            self._getPixelCount(station.getTimeStampsArray(), keep_view_limits),
+            downsampling_method,
+        )
+        return LineData(
             timestamps,
             values,
-            label=station_name,
-            marker="o" if len(timestamps) < max_marker_num else None,
-            markersize=4 if len(timestamps) < max_marker_num else None,
+            {
+                "label": station.getName(),
+                "marker": "o" if len(timestamps) < max_marker_num else None,
+                "markersize": 4 if len(timestamps) < max_marker_num else None,
+            },
         )
 
+    def _getPixelCount(self, timestamps: np.ndarray, keep_view_limits: bool) -> int:
+        # Pixels the whole line spans. When zoomed in, this is more than the
+        # width of the plot, so the visible part keeps its detail.
+        width = self._getPlotWidth()
+        if not keep_view_limits or len(timestamps) < 2:
+            return width
+        view_start, view_end = self._plot.canvas.ax.get_xlim()
+        data_span = mdates.date2num(timestamps[-1]) - mdates.date2num(timestamps[0])
+        return max(int(width * data_span / (view_end - view_start)), width)
+
     def _getAggregationString(self, options: SMEARPlotOptions):
         aggregation_string = (
             ""
@@ -68,4 +142,4 @@ class SMEARPlotter(Plotter):
         return aggregation_string
 
     def _isStationDataAvailable(self, station: Station):
-        return True if station.getConcentrations() else False
+        return station.hasData()
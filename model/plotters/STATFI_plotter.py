@@ -1,26 +1,39 @@
+from typing import Optional
 import numpy as np
 from model.data_models.figure import Figure
 from model.data_models.user_options import STATFIPlotOptions, STATFIPlotType
-from model.plotters.plotter import Plotter
-from ui.mplwidget import MplWidget
+from model.plotters.plotter import Plotter, PlotWidget
+from model.plotters.retained_lines import LineData, RetainedLines
 
 
 class STATFIPlotter(Plotter):
-    _plot: MplWidget
+    _plot: PlotWidget
+    _lines: RetainedLines
+    _plot_type: Optional[STATFIPlotType]
 
     def __init__(self, plot):
-        self._plot: MplWidget = plot
+        self._plot: PlotWidget = plot
+        self._lines = RetainedLines(self._plot.canvas.ax)
+        self._plot_type = None
 
     def plotData(self, data: list[Figure], options: STATFIPlotOptions):
         if not data:
             return
-        years: list[int] = data[0].getYears()
+        # The arrays of the figures are plotted as they are, without copies.
+        years: np.ndarray = data[0].getYearsArray()
         nameTexts: list[str] = [figure.getNameText() for figure in data]
-        plotData: list[list[float]] = [
-            list(figure.getYearlyData().values()) for figure in data
-        ]
+        plotData: list[np.ndarray] = [figure.getValuesArray() for figure in data]
 
-        self._plot.canvas.ax.clear()
+        # Bars are rebuilt on every plot, lines are kept as long as the plot type
+        # stays the same.
+        if (
+            options.plot_type == STATFIPlotType.BAR_CHART
+            or options.plot_type != self._plot_type
+        ):
+            self._clearPlot()
+        self._removeEmptyText()
+        self._plot_type = options.plot_type
+        self._plot.toolbar.update()
         if options.plot_type == STATFIPlotType.BAR_CHART:
             self._plotBarChart(plotData, years, nameTexts)
         elif options.plot_type == STATFIPlotType.LINE_GRAPH:
@@ -28,8 +41,13 @@ class STATFIPlotter(Plotter):
         else:
             raise ValueError("Unknown plot_by value")
 
+    def _clearPlot(self):
+        super()._clearPlot()
+        self._lines.forget()
+        self._plot_type = None
+
     def _plotBarChart(
-        self, data: list[list[float]], years: list[int], nameTexts: list[str]
+        self, data: list[np.ndarray], years: np.ndarray, nameTexts: list[str]
     ):
         year_label_locations = np.arange(len(years))
         x_location_increment = 0.25
@@ -45,20 +63,22 @@ class STATFIPlotter(Plotter):
                 label=nameTexts[i],
             )
         self._plot.canvas.ax.legend()
-        self._plot.canvas.draw()
+        self._plot.canvas.draw_idle()
 
     def _plotLineGraph(
-        self, data: list[list[float]], years: list[int], nameTexts: list[str]
+        self, data: list[np.ndarray], years: np.ndarray, nameTexts: list[str]
     ):
-        for i in np.arange(0, len(data)):
-            self._plot.canvas.ax.plot(
-                years,
-                data[i],
-                label=nameTexts[i],
-                marker="o",
-                linewidth=1,
-                markersize=4,
-            )
+        is_changed = self._lines.update(
+            {
+                nameText: LineData(
+                    years,
+                    values,
+                    {"label": nameText, "marker": "o", "linewidth": 1, "markersize": 4},
+                )
+                for nameText, values in zip(nameTexts, data)
+            }
+        )
         self._plot.canvas.ax.set_xticks(years)
-        self._plot.canvas.ax.legend()
-        self._plot.canvas.draw()
+        if is_changed:
+            self._plot.canvas.ax.legend()
+        self._plot.canvas.draw_idle()
@@ -1,139 +1,167 @@
-from typing import Any
+from typing import Any, Optional
 from datetime import datetime
 
 import numpy as np
 import matplotlib.dates as mdates
-from ui.mplwidget import MplWidget
+import matplotlib.ticker as mticker
 
-from model.plotters.plotter import Plotter
+from model.plotters.plotter import Plotter, PlotWidget
+from model.plotters.retained_lines import LineData, RetainedLines
 from model.data_models.station import Station  # type: ignore
-from model.data_models.user_options import ComparePlotOptions
+from model.data_models.user_options import (
+    ComparePlotOptions,
+    DownsamplingMethod,
+    isBreakdownComparison,
+)
+from model.utils.downsampler import downsampleStation  # type: ignore
 
 
 class ComparePlotter(Plotter):
-    _plot: MplWidget
+    _plot: PlotWidget
+    _STATFI_lines: RetainedLines
+    _SMEAR_lines: RetainedLines
+    _is_breakdown: Optional[bool]
 
-    def __init__(self, plot: MplWidget):
+    def __init__(self, plot: PlotWidget):
         self._plot = plot
         self._STATFI_ax = self._plot.canvas.ax
         self._SMEAR_ax = self._STATFI_ax.twinx()
+        self._STATFI_lines = RetainedLines(self._STATFI_ax)
+        self._SMEAR_lines = RetainedLines(self._SMEAR_ax)
+        self._is_breakdown = None
 
     def plotData(
         self,
         data: list[Any],
         options: ComparePlotOptions,
     ) -> None:
-
-        self._STATFI_ax.clear()
-        self._SMEAR_ax.clear()
-
         STATFI_data, SMEAR_data = data
 
+        self._removeEmptyText()
         if not STATFI_data:
             return
-        STATFI_years: list[int] = [int(year) for year in STATFI_data[0].getYears()]
+        self._plot.toolbar.update()
+        # The arrays of the figures are plotted as they are, without copies.
+        STATFI_years: np.ndarray = STATFI_data[0].getYearsArray()
         nameTexts: list[str] = [figure.getNameText() for figure in STATFI_data]
-        plotData: list[list[float]] = [
-            list(figure.getYearlyData().values()) for figure in STATFI_data
-        ]
-
-        if self._check_plot_breakdown(SMEAR_data, STATFI_years):
-            self._plot_breakdown_data(plotData, STATFI_years, nameTexts, SMEAR_data)
+        plotData: list[np.ndarray] = [figure.getValuesArray() for figure in STATFI_data]
+
+        is_breakdown = self._check_plot_breakdown(SMEAR_data, STATFI_years)
+        # The x axis holds dates in the breakdown and years in the average view,
+        # so lines are only kept while the view stays the same.
+        if is_breakdown != self._is_breakdown:
+            self._clearPlot()
+            self._is_breakdown = is_breakdown
+
+        if is_breakdown:
+            is_changed = self._plot_breakdown_data(
+                plotData,
+                STATFI_years,
+                nameTexts,
+                SMEAR_data,
+                options.downsampling_method,
+            )
         else:
-            self._plot_average_year_data(plotData, STATFI_years, nameTexts, SMEAR_data)
+            is_changed = self._plot_average_year_data(
+                plotData, STATFI_years, nameTexts, SMEAR_data
+            )
 
-        self._design_canvas(options.gas.name)
-        self._plot.canvas.draw()
+        self._SMEAR_ax.set_ylabel(
+            f"{options.gas.name} concentration (ppm) (from SMEAR)", color="tab:red"
+        )
+        if is_changed:
+            self._design_canvas()
+        self._plot.canvas.draw_idle()
 
-    def _check_consecutive_years(self, year_list: list[int]):
-        for i in range(len(year_list) - 1):
-            if year_list[i + 1] - year_list[i] != 1:
-                return False
-        return True
+    def _clearPlot(self):
+        super()._clearPlot()
+        self._SMEAR_ax.clear()
+        self._STATFI_lines.forget()
+        self._SMEAR_lines.forget()
+        self._is_breakdown = None
 
     def _check_plot_breakdown(
-        self, SMEAR_data: list[list[Station]], STATFI_years: list[int]
-    ):
-        # Only allow plot breakdown data if:
-        #   - Consecutive years if there are more than 1 year (ex: 2011-2013)
-        #   - Same year list on both STATFI and SMEAR
-
-        if len(SMEAR_data) != len(STATFI_years):
-            return False
-
-        if len(STATFI_years) > 1 and (not self._check_consecutive_years(STATFI_years)):
-            return False
-
-        for station_period_data, STATFI_year in zip(SMEAR_data, STATFI_years):
-            no_timestamp = 0
-            for station in station_period_data:
-                timestamps = station.getTimeStamps()
-                if not timestamps:
-                    no_timestamp += 1
-                    if no_timestamp == len(station_period_data):
-                        return False
-
-                    continue
-
-                if timestamps[0].year != STATFI_year:
-                    return False
-
-                continue  # No need to check further from other stations
-
-        return True
+        self, SMEAR_data: list[list[Station]], STATFI_years: np.ndarray
+    ) -> bool:
+        # The SMEAR data of a year is in the year of its first time stamp, and a
+        # year without any data can't be broken down.
+        SMEAR_years = []
+        for station_period_data in SMEAR_data:
+            first_timestamps = [
+                station.getTimeStampsArray()[0]
+                for station in station_period_data
+                if len(station.getTimeStampsArray())
+            ]
+            if not first_timestamps:
+                return False
+            SMEAR_years.append(first_timestamps[0].astype("datetime64[Y]").item().year)
+        return isBreakdownComparison(STATFI_years, SMEAR_years)
 
     def _plot_breakdown_data(
         self,
-        plotData: list[list[float]],
-        STATFI_years: list[int],
+        plotData: list[np.ndarray],
+        STATFI_years: np.ndarray,
         nameTexts: list[str],
         SMEAR_data: list[list[Station]],
-    ):
+        downsampling_method: DownsamplingMethod,
+    ) -> bool:
         # SMEAR
-        gas_data: dict[str, dict[str, list[float]]] = {}
+        gas_data: dict[str, list[Station]] = {}
         minmax_yearly_timestamp = []
 
         for station_period_data, STATFI_year in zip(SMEAR_data, STATFI_years):
-            min_timestamp = datetime(STATFI_year, 12, 31)
-            max_timestamp = datetime(STATFI_year, 1, 1)
+            min_timestamp = np.datetime64(datetime(STATFI_year, 12, 31), "ns")
+            max_timestamp = np.datetime64(datetime(STATFI_year, 1, 1), "ns")
 
             for station in station_period_data:
                 station_name = station.getName()
                 if station_name not in gas_data:
-                    gas_data[station_name] = {"years": [], "values": []}
+                    gas_data[station_name] = []
 
-                station_timestamp = station.getTimeStamps()
-                station_value = station.getConcentrations()
-                if station_timestamp:
-                    gas_data[station_name]["years"].extend(station_timestamp)
-                    gas_data[station_name]["values"].extend(station_value)
+                station_timestamp = station.getTimeStampsArray()
+                if len(station_timestamp):
+                    gas_data[station_name].append(station)
 
-                min_timestamp = min([min(station_timestamp), min_timestamp])
-                max_timestamp = max([max(station_timestamp), max_timestamp])
+                    min_timestamp = min(station_timestamp[0], min_timestamp)
+                    max_timestamp = max(station_timestamp[-1], max_timestamp)
 
             middle_timestamp = min_timestamp + (max_timestamp - min_timestamp) / 2
 
-            minmax_yearly_timestamp.append(middle_timestamp)
+            minmax_yearly_timestamp.append(
+                middle_timestamp.astype("datetime64[us]").item()
+            )
 
-        for station_name, station_data in gas_data.items():
-            self._SMEAR_ax.plot(
-                station_data["years"],
-                station_data["values"],
-                label=station_name,
-                alpha=0.6,
+        SMEAR_lines: dict[str, LineData] = {}
+        for station_name, station_periods in gas_data.items():
+            if not station_periods:
+                continue
+            station_timestamps, station_values = self._downsample_station_periods(
+                station_periods, self._getPlotWidth(), downsampling_method
             )
+            SMEAR_lines[station_name] = LineData(
+                station_timestamps,
+                station_values,
+                {"label": station_name, "alpha": 0.6},
+            )
+        is_SMEAR_changed = self._SMEAR_lines.update(SMEAR_lines)
 
         # STATFI
-        for i in np.arange(0, len(plotData)):
-            self._STATFI_ax.plot(
-                minmax_yearly_timestamp,
-                plotData[i],
-                label=nameTexts[i],
-                marker="*",
-                linewidth=1,
-                markersize=10,
-                linestyle="dashed",
-            )
+        is_STATFI_changed = self._STATFI_lines.update(
+            {
+                nameTexts[i]: LineData(
+                    minmax_yearly_timestamp,
+                    plotData[i],
+                    {
+                        "label": nameTexts[i],
+                        "marker": "*",
+                        "linewidth": 1,
+                        "markersize": 10,
+                        "linestyle": "dashed",
+                    },
+                )
+                for i in np.arange(0, len(plotData))
+            }
+        )
 
         new_datetime_format = "%d %b, %y \n %H:%M"
         self._STATFI_ax.xaxis.set_major_formatter(
@@ -145,15 +173,40 @@ class ComparePlotter(Plotter):
             labelsize="x-small",
             labelrotation=45,
         )
+        return is_SMEAR_changed or is_STATFI_changed
+
+    def _downsample_station_periods(
+        self,
+        station_periods: list[Station],
+        width: int,
+        downsampling_method: DownsamplingMethod,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Each period gets the share of the width its time range takes, so that
+        # the envelope of every period comes from its own summary pyramid.
+        first_timestamp = station_periods[0].getTimeStampsArray()[0]
+        total_span = station_periods[-1].getTimeStampsArray()[-1] - first_timestamp
+        timestamps, values = [], []
+        for station in station_periods:
+            station_timestamps = station.getTimeStampsArray()
+            span = station_timestamps[-1] - station_timestamps[0]
+            period_width = (
+                max(int(width * (span / total_span)), 1) if total_span else width
+            )
+            period_timestamps, period_values = downsampleStation(
+                station, period_width, downsampling_method
+            )
+            timestamps.append(period_timestamps)
+            values.append(period_values)
+        return np.concatenate(timestamps), np.concatenate(values)
 
     def _plot_average_year_data(
         self,
-        plotData: list[list[float]],
-        STATFI_years: list[int],
+        plotData: list[np.ndarray],
+        STATFI_years: np.ndarray,
         nameTexts: list[str],
         SMEAR_data: list[list[Station]],
         max_marker_num: int = 30,
-    ):
+    ) -> bool:
         # SMEAR
         gas_data: dict[str, dict[str, list[float]]] = {}
         for station_period_data in SMEAR_data:
@@ -162,38 +215,60 @@ class ComparePlotter(Plotter):
                 if station_name not in gas_data:
                     gas_data[station_name] = {"years": [], "values": []}
 
-                station_timestamp = station.getTimeStamps()
-                station_value = station.getConcentrations()
-                if station_timestamp:
-                    gas_data[station_name]["years"].append(station_timestamp[0].year)
-                    gas_data[station_name]["values"].append(np.mean(station_value))
-
-        for station_name, station_data in gas_data.items():
-            self._SMEAR_ax.plot(
-                station_data["years"],
-                station_data["values"],
-                label=station_name,
-                marker="o" if len(station_data["years"]) < max_marker_num else None,
-                linewidth=1,
-                markersize=6 if len(station_data["years"]) < max_marker_num else None,
-            )
+                station_timestamp = station.getTimeStampsArray()
+                if len(station_timestamp):
+                    gas_data[station_name]["years"].append(
+                        station_timestamp[0].astype("datetime64[Y]").item().year
+                    )
+                    gas_data[station_name]["values"].append(station.getSummary().mean)
+
+        is_SMEAR_changed = self._SMEAR_lines.update(
+            {
+                station_name: LineData(
+                    station_data["years"],
+                    station_data["values"],
+                    {
+                        "label": station_name,
+                        "marker": (
+                            "o" if len(station_data["years"]) < max_marker_num else None
+                        ),
+                        "linewidth": 1,
+                        "markersize": (
+                            6 if len(station_data["years"]) < max_marker_num else None
+                        ),
+                    },
+                )
+                for station_name, station_data in gas_data.items()
+            }
+        )
 
         # STATFI
-        for i in np.arange(0, len(plotData)):
-            self._STATFI_ax.plot(
-                STATFI_years,
-                plotData[i],
-                label=nameTexts[i],
-                marker="x" if len(STATFI_years) < max_marker_num else None,
-                linewidth=1,
-                markersize=6,
-                linestyle="dashed" if len(STATFI_years) < max_marker_num else None,
-            )
+        is_STATFI_changed = self._STATFI_lines.update(
+            {
+                nameTexts[i]: LineData(
+                    STATFI_years,
+                    plotData[i],
+                    {
+                        "label": nameTexts[i],
+                        "marker": "x" if len(STATFI_years) < max_marker_num else None,
+                        "linewidth": 1,
+                        "markersize": 6,
+                        "linestyle": (
+                            "dashed" if len(STATFI_years) < max_marker_num else None
+                        ),
+                    },
+                )
+                for i in np.arange(0, len(plotData))
+            }
+        )
 
+        # Ticks of the previous years are dropped before rounding the new ones.
+        self._STATFI_ax.xaxis.set_major_locator(mticker.AutoLocator())
         string_xticks = np.unique(np.rint(self._STATFI_ax.get_xticks()))
         self._STATFI_ax.set_xticks(string_xticks)
+        return is_SMEAR_changed or is_STATFI_changed
 
-    def _design_canvas(self, gas_name: str):
+    def _design_canvas(self):
         STATFI_color = "tab:green"
         self._STATFI_ax.set_xlabel("Timestamps")
         self._STATFI_ax.set_ylabel("STATFI", color=STATFI_color)
@@ -201,9 +276,6 @@ class ComparePlotter(Plotter):
         self._STATFI_ax.legend(loc="upper left", fontsize="x-small")
 
         SMEAR_color = "tab:red"
-        self._SMEAR_ax.set_ylabel(
-            f"{gas_name} concentration (ppm) (from SMEAR)", color=SMEAR_color
-        )
         self._SMEAR_ax.tick_params(axis="y", labelcolor=SMEAR_color)
         self._SMEAR_ax.legend(loc="upper right", fontsize="x-small")
 
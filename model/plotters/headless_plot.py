@@ -0,0 +1,36 @@
+from matplotlib.axes import Axes  # type: ignore
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # type: ignore
+from matplotlib.figure import Figure  # type: ignore
+
+
+# Agg canvas with the fig and ax of the MplCanvas of the window (ui.mplcanvas).
+class HeadlessCanvas(FigureCanvasAgg):
+    fig: Figure
+    ax: Axes
+
+    def __init__(self, width: float, height: float, dpi: float):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.ax = self.fig.add_subplot(111)
+        FigureCanvasAgg.__init__(self, self.fig)
+
+    def draw_idle(self, *args, **kwargs):
+        # Nothing is shown, the figure is only rendered when it is saved.
+        pass
+
+
+class _HeadlessToolbar:
+    def update(self):
+        pass
+
+
+class HeadlessPlot:
+    """Stands in for the MplWidget of a tab when plotting without Qt, e.g. from
+    the command line, so that the plotters draw straight into an Agg canvas.
+    """
+
+    canvas: HeadlessCanvas
+    toolbar: _HeadlessToolbar
+
+    def __init__(self, width: float = 6.4, height: float = 4.8, dpi: float = 100):
+        self.canvas = HeadlessCanvas(width, height, dpi)
+        self.toolbar = _HeadlessToolbar()
@@ -1,17 +1,26 @@
 from pathlib import Path
-from typing import Any
-from ui.mplwidget import MplWidget
+from typing import TYPE_CHECKING, Any, Optional, Union
+from matplotlib.text import Text  # type: ignore
+from model.plotters.headless_plot import HeadlessPlot
+
+if TYPE_CHECKING:
+    from ui.mplwidget import MplWidget
+
+# The plot widget of a tab, or an Agg plot when there is no window. Qt is only
+# imported by the window, so that the plotters also run without it.
+PlotWidget = Union["MplWidget", HeadlessPlot]
 
 
 class Plotter:
-    _plot: MplWidget
+    _plot: PlotWidget
+    _empty_text: Optional[Text] = None
 
     def plotData(self, data: list[Any], options: Any) -> None:
         raise NotImplementedError("This is an abstract method.")
 
     def showEmptyText(self) -> None:
-        self._plot.canvas.ax.clear()
-        self._plot.canvas.ax.text(
+        self._clearPlot()
+        self._empty_text = self._plot.canvas.ax.text(
             0.5,
             0.5,
             "No data to plot",
@@ -20,5 +29,19 @@ class Plotter:
         )
         self._plot.canvas.draw()
 
+    def _clearPlot(self):
+        # Subclasses keeping artists between plots forget them here as well.
+        self._plot.canvas.ax.clear()
+        self._empty_text = None
+
+    def _removeEmptyText(self):
+        if self._empty_text is not None:
+            self._empty_text.remove()
+            self._empty_text = None
+
+    def _getPlotWidth(self) -> int:
+        # Width of the axes in pixels, the most points a line can show apart.
+        return max(int(self._plot.canvas.ax.get_window_extent().width), 1)
+
     def savePlot(self, file_path: Path):
         self._plot.canvas.fig.savefig(fname=file_path, format="png")
@@ -0,0 +1,67 @@
+from typing import Any, Hashable, Mapping, NamedTuple
+
+from matplotlib.axes import Axes  # type: ignore
+from matplotlib.lines import Line2D  # type: ignore
+
+
+class LineData(NamedTuple):
+    x: Any
+    y: Any
+    # Keyword arguments of Axes.plot, e.g. the label and marker of the line.
+    properties: dict[str, Any]
+
+
+class RetainedLines:
+    """Lines of one axes kept between plots, one per series key such as a
+    station or a figure. A series plotted again with the same style only gets
+    its data replaced, so its artist, color and legend entry are kept.
+    """
+
+    _ax: Axes
+    _lines: dict[Hashable, Line2D]
+    _properties: dict[Hashable, dict[str, Any]]
+
+    def __init__(self, ax: Axes):
+        self._ax = ax
+        self._lines = {}
+        self._properties = {}
+
+    def update(self, series: Mapping[Hashable, LineData], rescale: bool = True) -> bool:
+        """Show exactly the given series on the axes and, if rescale is set, fit
+        the view to them. Returns whether lines were added, removed or restyled,
+        in which case the legend has to be rebuilt.
+        """
+        is_changed = False
+        for key in list(self._lines):
+            if key not in series:
+                self._removeLine(key)
+                is_changed = True
+
+        for key, line_data in series.items():
+            line = self._lines.get(key)
+            if line is not None and self._properties[key] == line_data.properties:
+                line.set_data(line_data.x, line_data.y)
+                continue
+
+            properties = dict(line_data.properties)
+            if line is not None:
+                # Keep the color of the series when its style changes.
+                properties.setdefault("color", line.get_color())
+                self._removeLine(key)
+            (self._lines[key],) = self._ax.plot(line_data.x, line_data.y, **properties)
+            self._properties[key] = line_data.properties
+            is_changed = True
+
+        if rescale:
+            self._ax.relim()
+            self._ax.autoscale_view()
+        return is_changed
+
+    def forget(self):
+        # For when the axes was cleared and the lines are gone already.
+        self._lines = {}
+        self._properties = {}
+
+    def _removeLine(self, key: Hashable):
+        self._lines.pop(key).remove()
+        del self._properties[key]
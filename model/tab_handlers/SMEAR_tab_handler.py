@@ -1,5 +1,8 @@
+from dataclasses import replace
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional, Union
+import numpy as np
+from model.data_models.fetch_results import FetchFailure, SMEARResult
 from model.data_models.station import Station
 from model.data_models.user_options import (
     SMEARAggregation,
@@ -8,13 +11,22 @@ from model.data_models.user_options import (
     SMEARPlotOptions,
 )
 from model.dialog_handlers.SMEAR_dialog_handler import SMEARDialogHandler  # type: ignore
-from model.factories.station_factory import StationFactory  # type: ignore
 from model.plotters.SMEAR_plotter import SMEARPlotter
 from model.tab_handlers.tab_handler import TabHandler
-from model.utils.consts import ALL_SMEAR_STATIONS  # type: ignore
-from model.utils.data_fetcher import DataFetcher  # type: ignore
+from model.utils.consts import (  # type: ignore
+    ALL_SMEAR_STATIONS,
+    SMEAR_VARIABLES_BY_STATION,
+    SMEAR_ZOOM_INTERVALS,
+    SMEAR_ZOOM_MAX_POINTS,
+    SMEAR_ZOOM_REFINE_DELAY_MS,
+)
+from model.utils.fetch_scheduler import FetchPriority  # type: ignore
+from model.utils.request_builder import SMEAR_HOST  # type: ignore
+from model.utils.resampler import canResample, resampleStation  # type: ignore
+from model.utils.result_builder import ResultBuilder  # type: ignore
+from model.utils.SMEAR_metadata import SMEAR_METADATA  # type: ignore
 from PyQt6 import QtCore, QtWidgets
-from PyQt6.QtCore import QObject, pyqtSlot
+from PyQt6.QtCore import QObject, QTimer, pyqtSlot
 from PyQt6.QtWidgets import (
     QDateTimeEdit,
     QGroupBox,
@@ -42,8 +54,14 @@ class SMEARTabHandler(TabHandler, QObject):
     _ui_save_plot_button: QPushButton
     _plotter: SMEARPlotter
     _parent_view: QMainWindow
+    _zoom_timer: QTimer
 
     _stations: list[Station] = []
+    # Data as fetched, which _stations is resampled from.
+    _source_stations: list[Station] = []
+    _source_options: Optional[SMEAROptions] = None
+    # Options of the finer data being fetched for the zoomed in range.
+    _zoom_options: Optional[SMEAROptions] = None
 
     def __init__(
         self,
@@ -71,15 +89,23 @@ class SMEARTabHandler(TabHandler, QObject):
         self._ui_waiting_spinner = QtWaitingSpinner(self._parent_view)
         self._plotter = SMEARPlotter(ui_plot)
         self._ui_gas_radio_buttons_group = QButtonGroup()
+        self._zoom_timer = QTimer(self)
 
         self._setupComponents()
         self._ui_options = self.getUIOptions()
         self._stations = []
+        self._source_stations = []
         self._mightToggleFetchButton()
 
     def fetchAndVisualise(self):
+        self._zoom_options = None
+        self._cancelFetch("zoom")
         self._fetchInBackground(
-            DataFetcher.fetchSMEARData, self.getUIOptions(), "_visualise"
+            "data",
+            ResultBuilder.buildSMEARResult,
+            self.getUIOptions(),
+            "_visualise",
+            [SMEAR_HOST],
         )
 
     def getUIOptions(self) -> SMEAROptions:
@@ -127,17 +153,207 @@ class SMEARTabHandler(TabHandler, QObject):
         )
         self._SMEAR_dialog_handler.setupSummaryDialog()
 
-    @pyqtSlot(dict)
-    def _visualise(self, stations_data: dict[str, Any]):
+    @pyqtSlot(object)
+    def _visualise(self, result: Union[SMEARResult, FetchFailure]):
         self._ui_waiting_spinner.stop()
 
-        if self._hasRequestError(stations_data):
-            self._showErrorMessage(
-                self._parent_view, str(stations_data["error_message"])
+        if isinstance(result, FetchFailure) or result.error_message is not None:
+            self._showErrorMessage(self._parent_view, str(result.error_message))
+            return
+
+        self._source_options = result.source_options
+        self._source_stations = list(result.source_stations)
+        self._stations = list(result.stations)
+        # The aggregation might have been changed while fetching.
+        aggregation = self._getSelectedAggregationMethod()
+        if aggregation != result.options.aggregation_method:
+            self._stations = self._resampleSourceStations(aggregation)
+        self._plotStations()
+
+        self._ui_options = self.getUIOptions()
+        self._togglePlotActionButtons()
+
+    @pyqtSlot(object)
+    def _visualiseVisibleRange(self, result: Union[SMEARResult, FetchFailure]):
+        # Results of a range that is no longer visible are dropped, as are
+        # errors since the coarse data stays on the plot.
+        if (
+            isinstance(result, FetchFailure)
+            or result.error_message is not None
+            or result.options != self._zoom_options
+        ):
+            return
+        self._zoom_options = None
+        self._plotVisibleStations(
+            self._spliceStations(
+                list(result.stations),
+                result.options.start_date_time,
+                result.options.end_date_time,
             )
+        )
+
+    def _onVisibleRangeChanged(self):
+        # Zooming and panning change the range many times in a row, so the data
+        # is refined only once the view has settled.
+        if self._isDataAvailable():
+            self._zoom_timer.start()
+
+    def _refineVisibleRange(self):
+        if not self._isDataAvailable() or self._source_options is None:
             return
+        start, end = self._plotter.getVisibleRange()
+        start = max(start, self._ui_options.start_date_time)
+        end = min(end, self._ui_options.end_date_time)
+        aggregation = self._getSelectedAggregationMethod()
+        interval = self._getVisibleRangeInterval(start, end)
+
+        self._zoom_options = None
+        if start >= end or aggregation == SMEARAggregation.NONE or interval is None:
+            # The data shown is already as fine as the visible range needs.
+            self._plotVisibleStations(self._stations)
+        elif canResample(
+            self._source_options.aggregation_method,
+            int(self._source_options.interval),
+            aggregation,
+            interval,
+        ):
+            self._plotVisibleStations(
+                self._spliceStations(
+                    [
+                        resampleStation(
+                            self._sliceStation(station, start, end),
+                            interval,
+                            aggregation,
+                        )
+                        for station in self._source_stations
+                    ],
+                    start,
+                    end,
+                )
+            )
+        else:
+            # The coarse data is shown meanwhile, redrawn for the new view.
+            self._plotVisibleStations(self._stations)
+            self._zoom_options = replace(
+                self._ui_options,
+                aggregation_method=aggregation,
+                start_date_time=start,
+                end_date_time=end,
+                interval=str(interval),
+            )
+            self._fetchInBackground(
+                "zoom",
+                ResultBuilder.buildSMEARResult,
+                self._zoom_options,
+                "_visualiseVisibleRange",
+                [SMEAR_HOST],
+                show_spinner=False,
+            )
 
-        self._stations = StationFactory.build(stations_data)
+    def _getVisibleRangeInterval(self, start: datetime, end: datetime) -> Optional[int]:
+        visible_minutes = (end - start).total_seconds() / 60
+        for interval in SMEAR_ZOOM_INTERVALS:
+            if interval >= int(self._ui_options.interval):
+                break
+            if visible_minutes / interval <= SMEAR_ZOOM_MAX_POINTS:
+                return interval
+        return None
+
+    def _spliceStations(
+        self, fine_stations: list[Station], start: datetime, end: datetime
+    ) -> list[Station]:
+        # Replaces the range between start and end of the stations shown with the
+        # finer data, keeping the coarse data around it for panning.
+        fine_stations_by_id = {
+            station.getIdentifier(): station for station in fine_stations
+        }
+        spliced_stations = []
+        for station in self._stations:
+            fine_station = fine_stations_by_id.get(station.getIdentifier())
+            if fine_station is None:
+                spliced_stations.append(station)
+                continue
+            time_stamps = station.getTimeStampsArray()
+            concentrations = station.getConcentrationsArray()
+            start_index, end_index = self._getRangeIndices(time_stamps, start, end)
+            spliced_station = Station(station.getIdentifier())
+            spliced_station.setTimeStamps(
+                np.concatenate(
+                    [
+                        time_stamps[:start_index],
+                        fine_station.getTimeStampsArray(),
+                        time_stamps[end_index:],
+                    ]
+                )
+            )
+            spliced_station.setConcentrations(
+                np.concatenate(
+                    [
+                        concentrations[:start_index],
+                        fine_station.getConcentrationsArray(),
+                        concentrations[end_index:],
+                    ]
+                )
+            )
+            spliced_stations.append(spliced_station)
+        return spliced_stations
+
+    def _sliceStation(
+        self, station: Station, start: datetime, end: datetime
+    ) -> Station:
+        start_index, end_index = self._getRangeIndices(
+            station.getTimeStampsArray(), start, end
+        )
+        sliced_station = Station(station.getIdentifier())
+        sliced_station.setTimeStamps(
+            station.getTimeStampsArray()[start_index:end_index]
+        )
+        sliced_station.setConcentrations(
+            station.getConcentrationsArray()[start_index:end_index]
+        )
+        return sliced_station
+
+    def _getRangeIndices(
+        self, time_stamps: np.ndarray, start: datetime, end: datetime
+    ) -> tuple[int, int]:
+        return (
+            int(np.searchsorted(time_stamps, np.datetime64(start), side="left")),
+            int(np.searchsorted(time_stamps, np.datetime64(end), side="right")),
+        )
+
+    def _plotVisibleStations(self, stations: list[Station]):
+        self._plotter.plotData(
+            stations,
+            SMEARPlotOptions(
+                self._getSelectedSMEARGas(),
+                self._getSelectedAggregationMethod(),
+            ),
+            keep_view_limits=True,
+        )
+
+    def _visualiseAggregation(self):
+        # Re-aggregate the data already fetched instead of fetching it again.
+        aggregation = self._getSelectedAggregationMethod()
+        if not self._source_stations:
+            return
+        if not self._canResampleSource(aggregation):
+            # The data was fetched aggregated, e.g. for a range too long for raw
+            # data, so the new aggregation is fetched from SMEAR.
+            self._zoom_options = None
+            self._cancelFetch("zoom")
+            self._fetchInBackground(
+                "data",
+                ResultBuilder.buildSMEARResult,
+                replace(self._ui_options, aggregation_method=aggregation),
+                "_visualise",
+                [SMEAR_HOST],
+            )
+            return
+        self._stations = self._resampleSourceStations(aggregation)
+        self._plotStations()
+        self._ui_options = replace(self._ui_options, aggregation_method=aggregation)
+
+    def _plotStations(self):
         if self._isDataAvailable():
             self._plotter.plotData(
                 self._stations,
@@ -148,31 +364,48 @@ class SMEARTabHandler(TabHandler, QObject):
             )
         else:
             self._plotter.showEmptyText()
+        # Fitting the view to new data is not a zoom to refine.
+        self._zoom_timer.stop()
+
+    def _canResampleSource(self, aggregation: SMEARAggregation) -> bool:
+        if self._source_options is None:
+            return False
+        return canResample(
+            self._source_options.aggregation_method,
+            int(self._source_options.interval),
+            aggregation,
+            int(self._source_options.interval),
+        )
 
-        self._ui_options = self.getUIOptions()
-        self._togglePlotActionButtons()
+    def _resampleSourceStations(self, aggregation: SMEARAggregation) -> list[Station]:
+        if self._source_options is None:
+            return self._source_stations
+        return ResultBuilder.resampleSMEARStations(
+            self._source_stations, self._source_options, aggregation
+        )
 
-    @pyqtSlot(dict)
-    def _setBoundariesToCalendar(self, metadata: dict[str, Any]):
+    @pyqtSlot(object)
+    def _setBoundariesToCalendar(self, boundaries: Union[dict[str, Any], FetchFailure]):
         self._ui_waiting_spinner.stop()
-        if self._hasRequestError(metadata):
-            self._showErrorMessage(self._parent_view, str(metadata["error_message"]))
+        if isinstance(boundaries, FetchFailure):
+            self._showErrorMessage(self._parent_view, boundaries.error_message)
+            return
+        if self._hasRequestError(boundaries):
+            self._showErrorMessage(self._parent_view, str(boundaries["error_message"]))
             return
+        self._updateCalendarBoundaries(boundaries)
 
+    def _updateCalendarBoundaries(self, boundaries: dict[str, Any]):
         self._parent_view.setEnabled(True)
-        periodStarts: list[str] = []
-        periodEnds: list[str] = []
-        periodStarts.append(metadata["periodStart"])
-        periodEnds.append(metadata["periodEnd"])
         periodStart = QtCore.QDateTime.fromString(
-            max(periodStarts), QtCore.Qt.DateFormat.ISODate
+            boundaries["periodStart"], QtCore.Qt.DateFormat.ISODate
         )
         self._ui_start_time_edit.setMinimumDateTime(periodStart)
         self._ui_end_time_edit.setMinimumDateTime(periodStart)
 
-        if None not in periodEnds:
+        if boundaries["periodEnd"] is not None:
             periodEnd = QtCore.QDateTime.fromString(
-                min(periodEnds), QtCore.Qt.DateFormat.ISODate
+                boundaries["periodEnd"], QtCore.Qt.DateFormat.ISODate
             )
             self._ui_end_time_edit.setMaximumDateTime(periodEnd)
             self._ui_start_time_edit.setMaximumDateTime(periodEnd)
@@ -195,8 +428,9 @@ class SMEARTabHandler(TabHandler, QObject):
 
     def _addAvailableStationsToSelectionList(self):
         self._ui_stations_list.clear()
+        gas = self._getSelectedSMEARGas().value
         for station in ALL_SMEAR_STATIONS:
-            if self._getSelectedSMEARGas().value in ALL_SMEAR_STATIONS[station]:
+            if (station, gas) in SMEAR_VARIABLES_BY_STATION:
                 self._ui_stations_list.addItem(station)
 
     def _fetchMetaData(self):
@@ -205,16 +439,28 @@ class SMEARTabHandler(TabHandler, QObject):
         self._ui_end_time_edit.clearMinimumDateTime()
         self._ui_end_time_edit.clearMaximumDateTime()
 
-        if self._ui_stations_list.selectedItems():
-            stations = self._ui_stations_list.selectedItems()
-            for station in stations:
-                gas = self._getSelectedSMEARGas().value
-                data = ALL_SMEAR_STATIONS[station.text()][gas]
-                self._fetchInBackground(
-                    DataFetcher.fetchSMEARVariableMetadata,
-                    {"table": data["table"], "variable": data["variable"]},
-                    "_setBoundariesToCalendar",
-                )
+        gas = self._getSelectedSMEARGas().value
+        tablevariables = [
+            SMEAR_VARIABLES_BY_STATION[(station.text(), gas)].tablevariable
+            for station in self._ui_stations_list.selectedItems()
+        ]
+        # The boundaries of the whole selection are set at once, right away when
+        # they are cached.
+        boundaries = SMEAR_METADATA.getCachedBoundaries(tablevariables)
+        if not tablevariables or boundaries is not None:
+            self._cancelFetch("metadata")
+            self._ui_waiting_spinner.stop()
+            if boundaries is not None:
+                self._updateCalendarBoundaries(boundaries)
+            return
+        self._fetchInBackground(
+            "metadata",
+            SMEAR_METADATA.getBoundaries,
+            tablevariables,
+            "_setBoundariesToCalendar",
+            [SMEAR_HOST],
+            FetchPriority.METADATA,
+        )
 
     def _setupComponents(self):
         for station in ALL_SMEAR_STATIONS:
@@ -237,6 +483,17 @@ class SMEARTabHandler(TabHandler, QObject):
 
         self._ui_stations_list.itemSelectionChanged.connect(self._fetchMetaData)
 
+        aggregation_buttons: list = self._ui_aggregation_radio_buttons.findChildren(
+            QRadioButton
+        )
+        for button in aggregation_buttons:
+            button.clicked.connect(self._visualiseAggregation)
+
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(SMEAR_ZOOM_REFINE_DELAY_MS)
+        self._zoom_timer.timeout.connect(self._refineVisibleRange)
+        self._plotter.setVisibleRangeCallback(self._onVisibleRangeChanged)
+
     def _getSelectedSMEARGas(self) -> SMEARGas:
         return SMEARGas[self._ui_gas_radio_buttons_group.checkedButton().text()]
 
@@ -259,6 +516,6 @@ class SMEARTabHandler(TabHandler, QObject):
 
     def _isDataAvailable(self):
         for station in self._stations:
-            if station.getConcentrations():
+            if station.hasData():
                 return True
         return False
@@ -1,3 +1,6 @@
+from typing import Union
+
+from model.data_models.fetch_results import FetchFailure, STATFIResult
 from model.data_models.figure import Figure
 from model.utils.consts import ALL_STATFI_LABELS, YEAR_END_STATFI_DATA, YEAR_START_STATFI_DATA  # type: ignore
 from model.data_models.user_options import (
@@ -5,9 +8,9 @@ from model.data_models.user_options import (
     STATFIPlotType,
     STATFIPlotOptions,
 )
-from model.factories.figure_factory import FigureFactory  # type: ignore
 from model.tab_handlers.tab_handler import TabHandler
-from model.utils.data_fetcher import DataFetcher  # type: ignore
+from model.utils.request_builder import STATFI_HOST  # type: ignore
+from model.utils.result_builder import ResultBuilder  # type: ignore
 from model.plotters.STATFI_plotter import STATFIPlotter
 from PyQt6.QtWidgets import (
     QDateTimeEdit,
@@ -17,7 +20,6 @@ from PyQt6.QtWidgets import (
     QRadioButton,
     QButtonGroup,
 )
-from typing import Any
 from PyQt6 import QtCore
 from PyQt6.QtCore import QObject, pyqtSlot
 from ui.mplwidget import MplWidget
@@ -62,11 +64,17 @@ class STATFITabHandler(TabHandler, QObject):
         self._setupComponents()
         self._ui_options = self.getUIOptions()
         self._mightToggleFetchButton()
+        self._mightRefreshSTATFISnapshot()
 
     def fetchAndVisualise(self):
         self._fetchInBackground(
-            DataFetcher.fetchSTATFIData, self.getUIOptions(), "_visualise"
+            "data",
+            ResultBuilder.buildSTATFIResult,
+            self.getUIOptions(),
+            "_visualise",
+            [STATFI_HOST],
         )
+        self._mightRefreshSTATFISnapshot()
 
     def getUIOptions(self) -> STATFIOptions:
         figures = self._ui_figures_list.selectedItems()
@@ -93,16 +101,14 @@ class STATFITabHandler(TabHandler, QObject):
             0 if options.plot_type == STATFIPlotType.BAR_CHART else 1
         ].setChecked(True)
 
-    @pyqtSlot(dict)
-    def _visualise(self, figures_data: dict[str, Any]):
+    @pyqtSlot(object)
+    def _visualise(self, result: Union[STATFIResult, FetchFailure]):
         self._ui_waiting_spinner.stop()
-        if self._hasRequestError(figures_data):
-            self._showErrorMessage(
-                self._parent_view, str(figures_data["error_message"])
-            )
+        if isinstance(result, FetchFailure) or result.error_message is not None:
+            self._showErrorMessage(self._parent_view, str(result.error_message))
             return
 
-        self._figures = FigureFactory.build(figures_data)
+        self._figures = list(result.figures)
 
         if self._isDataAvailable():
             self._plotter.plotData(
@@ -1,17 +1,20 @@
-from typing import Any
+from typing import Any, Union
 from datetime import datetime
-from model.factories.figure_factory import FigureFactory  # type: ignore
-from model.factories.station_factory import StationFactory  # type: ignore
+from model.data_models.fetch_results import ComparisonResult, FetchFailure
 from model.tab_handlers.tab_handler import TabHandler
 from model.utils.consts import (  # type: ignore
     ALL_SMEAR_STATIONS,
     ALL_STATFI_LABELS,
+    SMEAR_VARIABLES_BY_STATION,
     YEAR_END_STATFI_DATA,
     YEAR_START_STATFI_DATA,
 )
 from model.data_models.user_options import SMEARGas, CompareOptions, ComparePlotOptions
 from model.plotters.compare_plotter import ComparePlotter
-from model.utils.data_fetcher import DataFetcher  # type: ignore
+from model.utils.fetch_scheduler import FetchPriority  # type: ignore
+from model.utils.request_builder import SMEAR_HOST, STATFI_HOST  # type: ignore
+from model.utils.result_builder import ResultBuilder  # type: ignore
+from model.utils.SMEAR_metadata import SMEAR_METADATA  # type: ignore
 
 from ui.mplwidget import MplWidget
 from PyQt6 import QtCore
@@ -62,8 +65,13 @@ class CompareTabHandler(TabHandler, QObject):
 
     def fetchAndVisualise(self):
         self._fetchInBackground(
-            DataFetcher.fetchComparisonData, self.getUIOptions(), "_visualise"
+            "data",
+            ResultBuilder.buildComparisonResult,
+            self.getUIOptions(),
+            "_visualise",
+            [STATFI_HOST, SMEAR_HOST],
         )
+        self._mightRefreshSTATFISnapshot()
 
     def getUIOptions(self) -> CompareOptions:
         # STATFI
@@ -127,40 +135,46 @@ class CompareTabHandler(TabHandler, QObject):
     def _addAvailableStationsToSelectionList(self):
         self._ui_SMEAR_stations_list.clear()
         self._ui_SMEAR_years_list.clear()
+        gas = self._getSelectedSMEARGas().value
         for station in ALL_SMEAR_STATIONS:
-            if self._getSelectedSMEARGas().value in ALL_SMEAR_STATIONS[station]:
+            if (station, gas) in SMEAR_VARIABLES_BY_STATION:
                 self._ui_SMEAR_stations_list.addItem(station)
 
     def _fetchMetaData(self):
-        self._SMEARperiodStarts: list[str] = []
-        self._SMEARperiodEnds: list[str] = []
-        if self._ui_SMEAR_stations_list.selectedItems():
-            stations = self._ui_SMEAR_stations_list.selectedItems()
-            for station in stations:
-                gas = self._getSelectedSMEARGas().value
-                data = ALL_SMEAR_STATIONS[station.text()][gas]
-                self._fetchInBackground(
-                    DataFetcher.fetchSMEARVariableMetadata,
-                    {"table": data["table"], "variable": data["variable"]},
-                    "_setBoundariesToSMEARYearsList",
-                )
+        gas = self._getSelectedSMEARGas().value
+        tablevariables = [
+            SMEAR_VARIABLES_BY_STATION[(station.text(), gas)].tablevariable
+            for station in self._ui_SMEAR_stations_list.selectedItems()
+        ]
+        # The years of the whole selection are listed at once, right away when
+        # its boundaries are cached.
+        boundaries = SMEAR_METADATA.getCachedBoundaries(tablevariables)
+        if not tablevariables or boundaries is not None:
+            self._cancelFetch("metadata")
+            self._ui_waiting_spinner.stop()
+            if boundaries is not None:
+                self._updateSMEARYearsList(boundaries)
+            return
+        self._fetchInBackground(
+            "metadata",
+            SMEAR_METADATA.getBoundaries,
+            tablevariables,
+            "_setBoundariesToSMEARYearsList",
+            [SMEAR_HOST],
+            FetchPriority.METADATA,
+        )
 
-    @pyqtSlot(dict)
-    def _visualise(self, compare_data: dict[str, Any]):
+    @pyqtSlot(object)
+    def _visualise(self, result: Union[ComparisonResult, FetchFailure]):
         self._ui_waiting_spinner.stop()
-        if not compare_data:
+        if isinstance(result, FetchFailure) or result.error_message is not None:
+            self._showErrorMessage(self._parent_view, str(result.error_message))
             return
-
-        if self._hasRequestError(compare_data):
-            self._showErrorMessage(
-                self._parent_view, str(compare_data["error_message"])
-            )
+        if not result.figures and not result.stations:
             return
 
-        figures = FigureFactory.build(compare_data["STATFI"][0])
-        stations = [
-            StationFactory.build(SMEARdata) for SMEARdata in compare_data["SMEAR"]
-        ]
+        figures = list(result.figures)
+        stations = [list(year_stations) for year_stations in result.stations]
         self._plotter.plotData(
             [figures, stations], ComparePlotOptions(self._getSelectedSMEARGas())
         )
@@ -168,29 +182,31 @@ class CompareTabHandler(TabHandler, QObject):
         self._ui_options = self.getUIOptions()
         self._enablePlotActionButtons()
 
-    @pyqtSlot(dict)
-    def _setBoundariesToSMEARYearsList(self, metadata: dict[str, Any]):
+    @pyqtSlot(object)
+    def _setBoundariesToSMEARYearsList(
+        self, boundaries: Union[dict[str, Any], FetchFailure]
+    ):
         self._ui_waiting_spinner.stop()
-        if self._hasRequestError(metadata):
-            self._showErrorMessage(self._parent_view, str(metadata["error_message"]))
+        if isinstance(boundaries, FetchFailure):
+            self._showErrorMessage(self._parent_view, boundaries.error_message)
+            return
+        if self._hasRequestError(boundaries):
+            self._showErrorMessage(self._parent_view, str(boundaries["error_message"]))
             return
+        self._updateSMEARYearsList(boundaries)
+
+    def _updateSMEARYearsList(self, boundaries: dict[str, Any]):
         self._ui_SMEAR_years_list.clear()
         self._parent_view.setEnabled(True)
-        self._SMEARperiodStarts.append(metadata["periodStart"])
-        if metadata["periodEnd"] is not None:
-            self._SMEARperiodEnds.append(metadata["periodEnd"])
-
-        periodStart = max(self._SMEARperiodStarts)
-        yearStart = datetime.strptime(periodStart, "%Y-%m-%dT%H:%M:%S.%f").strftime(
-            "%Y"
-        )
+        yearStart = datetime.strptime(
+            boundaries["periodStart"], "%Y-%m-%dT%H:%M:%S.%f"
+        ).strftime("%Y")
 
         yearEnd = datetime.now().strftime("%Y")
-        if self._SMEARperiodEnds:
-            periodEnd = min(self._SMEARperiodEnds)
-            yearEnd = datetime.strptime(periodEnd, "%Y-%m-%dT%H:%M:%S.%f").strftime(
-                "%Y"
-            )
+        if boundaries["periodEnd"] is not None:
+            yearEnd = datetime.strptime(
+                boundaries["periodEnd"], "%Y-%m-%dT%H:%M:%S.%f"
+            ).strftime("%Y")
 
         for year in range(int(yearStart), int(yearEnd) + 1):
             self._ui_SMEAR_years_list.addItem(str(year))
@@ -1,11 +1,17 @@
 from pathlib import Path
-from typing import Any
+from typing import Any, Hashable, Iterable, Union
+from model.data_models.fetch_results import FetchFailure
 from model.plotters.plotter import Plotter
 
 from model.utils.file_manager import newFile  # type: ignore
 from ui.QtWaitingSpinner import QtWaitingSpinner
-from model.utils.data_fetcher import DataFetcherWrapper  # type: ignore
-from PyQt6.QtCore import QThreadPool
+from model.utils import consts  # type: ignore
+from model.utils.fetch_scheduler import (  # type: ignore
+    FETCH_SCHEDULER,
+    FetchPriority,
+)
+from model.utils.request_builder import STATFI_HOST  # type: ignore
+from model.utils.STATFI_snapshot import STATFI_SNAPSHOT  # type: ignore
 from PyQt6.QtWidgets import QMessageBox, QMainWindow
 
 
@@ -37,11 +43,54 @@ class TabHandler:
             return
         self._plotter.savePlot(Path(filename))
 
-    def _fetchInBackground(self, callable, param, callback):
-        self._fetcher_wrapper = DataFetcherWrapper(self, callable, param, callback)
-        self._ui_waiting_spinner.show()
-        self._ui_waiting_spinner.start()
-        QThreadPool.globalInstance().start(self._fetcher_wrapper)
+    def _fetchInBackground(
+        self,
+        purpose: Hashable,
+        callable,
+        param,
+        callback,
+        hosts: Iterable[str],
+        priority: FetchPriority = FetchPriority.VISIBLE,
+        show_spinner=True,
+        supersede=True,
+    ):
+        # A fetch supersedes the earlier one of this tab with the same purpose,
+        # whose callback then never fires.
+        if show_spinner:
+            self._ui_waiting_spinner.show()
+            self._ui_waiting_spinner.start()
+        FETCH_SCHEDULER.schedule(
+            (self, purpose),
+            callable,
+            param,
+            self,
+            callback,
+            priority,
+            hosts,
+            supersede,
+        )
+
+    def _cancelFetch(self, purpose: Hashable):
+        FETCH_SCHEDULER.cancel((self, purpose))
+
+    def _mightRefreshSTATFISnapshot(self):
+        # STATFI data is read from the snapshot, which is refreshed meanwhile
+        # when it is old so that later fetches get the new table.
+        if consts.USE_STATFI_SNAPSHOT and STATFI_SNAPSHOT.isStale():
+            self._fetchInBackground(
+                "STATFI snapshot",
+                STATFI_SNAPSHOT.refresh,
+                None,
+                "_onSTATFISnapshotRefreshed",
+                [STATFI_HOST],
+                FetchPriority.PREFETCH,
+                show_spinner=False,
+            )
+
+    def _onSTATFISnapshotRefreshed(self, is_changed: Union[bool, FetchFailure]):
+        # Nothing to redraw, the plot keeps the data it was fetched with. After a
+        # failure the old snapshot is kept.
+        pass
 
     def _hasRequestError(self, data: dict[str, Any]) -> bool:
         if "error_message" in data:
@@ -0,0 +1,238 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from model.utils import consts  # type: ignore
+from model.utils.cache_file import (  # type: ignore
+    lockCacheFile,
+    replaceCacheFile,
+    trySavingCacheFile,
+)
+
+Interval = tuple[datetime, datetime]
+
+
+class _CacheEntry:
+    # Sorted, unique sample times with their values. Missing values are NaN.
+    samptimes: np.ndarray
+    values: np.ndarray
+    # Sorted, non-overlapping half-open [start, end) intervals already fetched.
+    intervals: list[Interval]
+
+    def __init__(self):
+        self.samptimes = np.array([], dtype="datetime64[ms]")
+        self.values = np.array([], dtype=np.float64)
+        self.intervals = []
+
+
+class SMEARCache:
+    """On-disk cache of SMEAR timeseries. An entry is kept per
+    (tablevariable, aggregation, interval) together with the time intervals it
+    already covers, so only the missing parts of a request have to be fetched.
+    """
+
+    _directory: str
+    _entries: dict[tuple[str, str, str], _CacheEntry]
+    _lock: threading.Lock
+
+    def __init__(self, directory: str = consts.SMEAR_CACHE_DIRECTORY):
+        self._directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def getMissingIntervals(
+        self,
+        tablevariable: str,
+        aggregation: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+    ) -> list[Interval]:
+        with self._lock:
+            entry = self._getEntry((tablevariable, aggregation, interval))
+            covered = list(entry.intervals)
+
+        missing: list[Interval] = []
+        cursor = start
+        for covered_start, covered_end in covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            missing.append((cursor, end))
+
+        # Aggregated rows are bucketed by the interval, so widen the gaps to whole
+        # buckets to not fetch partially filled ones.
+        if aggregation != "NONE":
+            missing = [
+                (
+                    _floorToInterval(gap_start, int(interval)),
+                    _ceilToInterval(gap_end, int(interval)),
+                )
+                for gap_start, gap_end in missing
+            ]
+        return missing
+
+    def store(
+        self,
+        tablevariable: str,
+        aggregation: str,
+        interval: str,
+        covered: Interval,
+        samptimes: np.ndarray,
+        values: np.ndarray,
+    ):
+        new_samptimes = np.asarray(samptimes, dtype="datetime64[ms]")
+        new_values = np.asarray(values, dtype=np.float64)
+        key = (tablevariable, aggregation, interval)
+        with self._lock:
+            entry = self._getEntry(key)
+            covered_start = np.datetime64(covered[0], "ms")
+            covered_end = np.datetime64(covered[1], "ms")
+            kept = (entry.samptimes < covered_start) | (entry.samptimes >= covered_end)
+            all_samptimes = np.concatenate([entry.samptimes[kept], new_samptimes])
+            all_values = np.concatenate([entry.values[kept], new_values])
+            entry.samptimes, entry.values = _keepLastSamples(all_samptimes, all_values)
+            if covered[0] < covered[1]:
+                entry.intervals = mergeIntervals(entry.intervals + [covered])
+            trySavingCacheFile(lambda: self._saveEntry(key))
+
+    def load(
+        self,
+        tablevariable: str,
+        aggregation: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            entry = self._getEntry((tablevariable, aggregation, interval))
+            start_index, end_index = np.searchsorted(
+                entry.samptimes,
+                [np.datetime64(start, "ms"), np.datetime64(end, "ms")],
+                side="left",
+            )
+            if end_index < len(entry.samptimes) and entry.samptimes[
+                end_index
+            ] == np.datetime64(end, "ms"):
+                end_index += 1
+            return (
+                entry.samptimes[start_index:end_index],
+                entry.values[start_index:end_index],
+            )
+
+    def _getEntry(self, key: tuple[str, str, str]) -> _CacheEntry:
+        if key not in self._entries:
+            self._entries[key] = self._loadEntry(key)
+        return self._entries[key]
+
+    def _getEntryPath(self, key: tuple[str, str, str]) -> str:
+        tablevariable, aggregation, interval = key
+        return os.path.join(
+            self._directory, f"{tablevariable}_{aggregation}_{interval}.npz"
+        )
+
+    def _loadEntry(self, key: tuple[str, str, str]) -> _CacheEntry:
+        entry = _CacheEntry()
+        try:
+            with np.load(self._getEntryPath(key)) as cached:
+                entry.samptimes = cached["samptimes"]
+                entry.values = cached["values"]
+                entry.intervals = [
+                    (start.item(), end.item()) for start, end in cached["intervals"]
+                ]
+        except (OSError, KeyError, ValueError):
+            # Missing or unreadable cache file, start over.
+            return _CacheEntry()
+        return entry
+
+    def _saveEntry(self, key: tuple[str, str, str]):
+        # Other processes may have saved the entry meanwhile, so what they fetched
+        # is merged in first, with this entry's data kept where both have some.
+        path = self._getEntryPath(key)
+        with lockCacheFile(path):
+            entry = _mergeEntries(self._loadEntry(key), self._entries[key])
+            self._entries[key] = entry
+            with replaceCacheFile(path) as cache_file:
+                np.savez(
+                    cache_file,
+                    samptimes=entry.samptimes,
+                    values=entry.values,
+                    intervals=np.array(entry.intervals, dtype="datetime64[ms]").reshape(
+                        -1, 2
+                    ),
+                )
+
+
+def _mergeEntries(saved: _CacheEntry, entry: _CacheEntry) -> _CacheEntry:
+    merged = _CacheEntry()
+    if entry.intervals:
+        starts, ends = np.array(entry.intervals, dtype="datetime64[ms]").T
+        indices = np.searchsorted(starts, saved.samptimes, side="right") - 1
+        in_entry = (indices >= 0) & (saved.samptimes < ends[np.maximum(indices, 0)])
+    else:
+        in_entry = np.zeros(len(saved.samptimes), dtype=bool)
+    merged.samptimes, merged.values = _keepLastSamples(
+        np.concatenate([saved.samptimes[~in_entry], entry.samptimes]),
+        np.concatenate([saved.values[~in_entry], entry.values]),
+    )
+    merged.intervals = mergeIntervals(saved.intervals + entry.intervals)
+    return merged
+
+
+def _keepLastSamples(
+    samptimes: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Sorted by sample time, keeping the last value when a sample time repeats.
+    _, last_indices = np.unique(samptimes[::-1], return_index=True)
+    indices = len(samptimes) - 1 - last_indices
+    return samptimes[indices], values[indices]
+
+
+def mergeIntervals(intervals: list[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _floorToInterval(time: datetime, interval_minutes: int) -> datetime:
+    midnight = time.replace(hour=0, minute=0, second=0, microsecond=0)
+    minutes = (time - midnight) // timedelta(minutes=interval_minutes)
+    return midnight + timedelta(minutes=minutes * interval_minutes)
+
+
+def _ceilToInterval(time: datetime, interval_minutes: int) -> datetime:
+    floored = _floorToInterval(time, interval_minutes)
+    if floored == time:
+        return time
+    return floored + timedelta(minutes=interval_minutes)
+
+
+def cachedColumnsToSMEARData(
+    columns: list[str], cached: list[tuple[np.ndarray, np.ndarray]]
+) -> dict[str, Any]:
+    # Rebuild the columnar form of a SMEAR response, aligning every column to the
+    # union of the sample times.
+    if cached:
+        all_samptimes = np.unique(
+            np.concatenate([samptimes for samptimes, _ in cached])
+        )
+    else:
+        all_samptimes = np.array([], dtype="datetime64[ms]")
+    all_values: dict[str, np.ndarray] = {}
+    for column, (samptimes, values) in zip(columns, cached):
+        aligned_values = np.full(len(all_samptimes), np.nan)
+        aligned_values[np.searchsorted(all_samptimes, samptimes)] = values
+        all_values[column] = aligned_values
+    return {"columns": columns, "samptimes": all_samptimes, "values": all_values}
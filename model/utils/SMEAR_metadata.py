@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+
+from model.utils import consts  # type: ignore
+from model.utils.cache_file import (  # type: ignore
+    lockCacheFile,
+    replaceCacheFile,
+    trySavingCacheFile,
+)
+from model.utils.data_fetcher import DataFetcher, createErrorDict  # type: ignore
+
+
+class SMEARMetadataService:
+    """Metadata of SMEAR variables by "<table>.<variable>", cached on disk for
+    ttl seconds. The variables missing from the cache are fetched in one
+    request, and a variable already being fetched for another caller is waited
+    for instead of being requested again.
+    """
+
+    _path: str
+    _ttl: float
+    # Time fetched (seconds since the epoch) and metadata of each variable.
+    _entries: dict[str, tuple[float, dict[str, Any]]]
+    _in_flight: dict[str, threading.Event]
+    _is_loaded: bool
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        path: str = consts.SMEAR_METADATA_CACHE_FILE,
+        ttl: float = consts.SMEAR_METADATA_TTL,
+    ):
+        self._path = path
+        self._ttl = ttl
+        self._entries = {}
+        self._in_flight = {}
+        self._is_loaded = False
+        self._lock = threading.Lock()
+
+    def getBoundaries(self, tablevariables: list[str]) -> dict[str, Any]:
+        """The period all the variables have data for, as the periodStart and
+        periodEnd of the SMEAR API, fetching the metadata missing from the cache.
+        """
+        metadata = self.getMetadata(tablevariables)
+        if "error_message" in metadata:
+            return metadata
+        return self._combineBoundaries(metadata.values())
+
+    def getCachedBoundaries(
+        self, tablevariables: list[str]
+    ) -> Optional[dict[str, Any]]:
+        # None unless all the variables are cached, so nothing has to be fetched.
+        with self._lock:
+            self._loadEntries()
+            metadata = [self._getFreshEntry(variable) for variable in tablevariables]
+        if not tablevariables or any(entry is None for entry in metadata):
+            return None
+        return self._combineBoundaries(metadata)  # type: ignore
+
+    def getMetadata(self, tablevariables: list[str]) -> dict[str, Any]:
+        waited_events = []
+        missing_variables = []
+        with self._lock:
+            self._loadEntries()
+            for variable in dict.fromkeys(tablevariables):
+                if self._getFreshEntry(variable) is not None:
+                    continue
+                if variable in self._in_flight:
+                    waited_events.append(self._in_flight[variable])
+                else:
+                    self._in_flight[variable] = threading.Event()
+                    missing_variables.append(variable)
+
+        error: dict[str, Any] = {}
+        if missing_variables:
+            fetched: dict[str, Any] = {}
+            try:
+                fetched = self._fetchMetadata(missing_variables)
+            finally:
+                self._storeEntries(missing_variables, fetched)
+            if "error_message" in fetched:
+                error = fetched
+        for event in waited_events:
+            event.wait()
+
+        with self._lock:
+            metadata = {
+                variable: self._getFreshEntry(variable) for variable in tablevariables
+            }
+        unavailable = [variable for variable, entry in metadata.items() if not entry]
+        if unavailable:
+            return error or createErrorDict(
+                f"Could not get the metadata of {', '.join(unavailable)} from SMEAR"
+            )
+        return metadata
+
+    def _fetchMetadata(self, tablevariables: list[str]) -> dict[str, Any]:
+        metadata = DataFetcher.fetchSMEARVariablesMetadata(tablevariables)
+        if "error_message" in metadata:
+            metadata = {}
+        # Variables the combined request did not answer are asked one by one.
+        remaining = [
+            variable for variable in tablevariables if variable not in metadata
+        ]
+        if not remaining:
+            return metadata
+        with ThreadPoolExecutor(
+            max_workers=min(len(remaining), consts.MAX_CONCURRENT_FETCHES)
+        ) as executor:
+            results = executor.map(
+                lambda variable: DataFetcher.fetchSMEARVariableMetadata(
+                    dict(zip(("table", "variable"), variable.split(".", 1)))
+                ),
+                remaining,
+            )
+            for variable, result in zip(remaining, results):
+                if "error_message" in result:
+                    return result
+                metadata[variable] = result
+        return metadata
+
+    def _storeEntries(self, tablevariables: list[str], metadata: dict[str, Any]):
+        with self._lock:
+            now = time.time()
+            for variable in tablevariables:
+                if variable in metadata:
+                    self._entries[variable] = (now, metadata[variable])
+                self._in_flight.pop(variable).set()
+            if any(variable in metadata for variable in tablevariables):
+                trySavingCacheFile(self._saveEntries)
+
+    def _getFreshEntry(self, tablevariable: str) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(tablevariable)
+        if entry is None or time.time() - entry[0] > self._ttl:
+            return None
+        return entry[1]
+
+    def _combineBoundaries(self, metadata: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        # A variable without a periodEnd still gets new data.
+        metadata = list(metadata)
+        period_ends = [
+            entry["periodEnd"] for entry in metadata if entry["periodEnd"] is not None
+        ]
+        return {
+            "periodStart": max(entry["periodStart"] for entry in metadata),
+            "periodEnd": min(period_ends) if period_ends else None,
+        }
+
+    def _loadEntries(self):
+        if self._is_loaded:
+            return
+        self._is_loaded = True
+        self._entries = self._readEntries()
+
+    def _readEntries(self) -> dict[str, tuple[float, dict[str, Any]]]:
+        try:
+            with open(self._path, encoding="utf-8") as cache_file:
+                return {
+                    variable: (float(entry["fetched"]), entry["metadata"])
+                    for variable, entry in json.load(cache_file).items()
+                }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Missing or unreadable cache file, start over.
+            return {}
+
+    def _saveEntries(self):
+        # Entries other processes saved meanwhile are kept, the newer one of a
+        # variable in both.
+        with lockCacheFile(self._path):
+            for variable, entry in self._readEntries().items():
+                if (
+                    variable not in self._entries
+                    or entry[0] > self._entries[variable][0]
+                ):
+                    self._entries[variable] = entry
+            with replaceCacheFile(self._path) as cache_file:
+                cache_file.write(
+                    json.dumps(
+                        {
+                            variable: {"fetched": fetched, "metadata": metadata}
+                            for variable, (fetched, metadata) in self._entries.items()
+                        }
+                    ).encode("utf-8")
+                )
+
+
+SMEAR_METADATA = SMEARMetadataService()
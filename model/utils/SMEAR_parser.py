@@ -0,0 +1,157 @@
+import codecs
+import json
+from array import array
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+# Size of the response body chunks read from the network.
+SMEAR_STREAM_CHUNK_SIZE = 1 << 16
+# Sample times are converted to datetime64 in batches of this many rows.
+_SAMPTIME_BATCH_SIZE = 65536
+# Consumed text is dropped from the buffer once it grows past this size.
+_BUFFER_COMPACT_SIZE = 1 << 16
+
+
+class SMEARStreamParser:
+    """Incremental decoder of a SMEAR timeseries response body. The rows of the
+    "data" array are decoded one by one straight into per-column arrays, so the
+    list of row dicts of the response is never built.
+
+    The result is the columnar form of the response: the "columns", the shared
+    "samptimes" as datetime64 and the "values" of each column as float64 arrays
+    with NaN for missing values.
+    """
+
+    _chunks: Iterator[bytes]
+    _buffer: str
+    _position: int
+    _is_exhausted: bool
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._is_exhausted = False
+
+    def parse(self) -> dict[str, Any]:
+        response: dict[str, Any] = {}
+        samptimes = np.array([], dtype="datetime64[ms]")
+        values: dict[str, np.ndarray] = {}
+
+        self._expect("{")
+        if self._peek() == "}":
+            self._position += 1
+        else:
+            while True:
+                key = self._decodeValue()
+                self._expect(":")
+                if key == "data":
+                    samptimes, values = self._parseRows()
+                else:
+                    response[key] = self._decodeValue()
+                if self._expect(",}") == "}":
+                    break
+
+        columns: list[str] = response.get("columns") or list(values.keys())
+        response["columns"] = columns
+        response["samptimes"] = samptimes
+        response["values"] = {
+            column: values.get(column, np.full(len(samptimes), np.nan))
+            for column in columns
+        }
+        return response
+
+    def _parseRows(self) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        samptime_batches: list[np.ndarray] = []
+        samptime_batch: list[str] = []
+        row_count = 0
+        column_values: dict[str, array] = {}
+
+        self._expect("[")
+        if self._peek() == "]":
+            self._position += 1
+        else:
+            while True:
+                row: dict[str, Any] = self._decodeValue()
+                samptime_batch.append(row.pop("samptime"))
+                for column, value in row.items():
+                    if column not in column_values:
+                        column_values[column] = array("d", [np.nan] * row_count)
+                    column_values[column].append(np.nan if value is None else value)
+                row_count += 1
+                # Columns missing from the row are padded to keep them aligned.
+                if len(row) < len(column_values):
+                    for values in column_values.values():
+                        if len(values) < row_count:
+                            values.append(np.nan)
+
+                if len(samptime_batch) == _SAMPTIME_BATCH_SIZE:
+                    samptime_batches.append(
+                        np.array(samptime_batch, dtype="datetime64[ms]")
+                    )
+                    samptime_batch = []
+                if self._expect(",]") == "]":
+                    break
+
+        samptime_batches.append(np.array(samptime_batch, dtype="datetime64[ms]"))
+        return np.concatenate(samptime_batches), {
+            column: np.frombuffer(values, dtype=np.float64)
+            for column, values in column_values.items()
+        }
+
+    def _decodeValue(self) -> Any:
+        self._skipWhitespace()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+                # A value touching the end of the buffer might continue in the
+                # next chunk, e.g. a number cut in half.
+                if end < len(self._buffer) or self._is_exhausted:
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                if self._is_exhausted:
+                    raise
+            self._readChunk()
+
+    def _expect(self, allowed: str) -> str:
+        character = self._peek()
+        if not character or character not in allowed:
+            raise ValueError(
+                f"Expected one of '{allowed}' at position {self._position} "
+                "in SMEAR response"
+            )
+        self._position += 1
+        return character
+
+    def _peek(self) -> str:
+        self._skipWhitespace()
+        return self._buffer[self._position : self._position + 1]
+
+    def _skipWhitespace(self):
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in " \t\n\r"
+            ):
+                self._position += 1
+            if self._position < len(self._buffer) or self._is_exhausted:
+                return
+            self._readChunk()
+
+    def _readChunk(self):
+        if self._position > _BUFFER_COMPACT_SIZE:
+            self._buffer = self._buffer[self._position :]
+            self._position = 0
+        try:
+            self._buffer += self._text_decoder.decode(next(self._chunks))
+        except StopIteration:
+            self._buffer += self._text_decoder.decode(b"", final=True)
+            self._is_exhausted = True
+
+
+def parseSMEARResponse(chunks: Iterable[bytes]) -> dict[str, Any]:
+    return SMEARStreamParser(chunks).parse()
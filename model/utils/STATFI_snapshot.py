@@ -0,0 +1,227 @@
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+import requests
+
+from model.data_models.user_options import STATFIOptions
+from model.utils import consts  # type: ignore
+from model.utils.cache_file import (  # type: ignore
+    replaceCacheFile,
+    trySavingCacheFile,
+)
+from model.utils.http_session import HTTP_SESSIONS  # type: ignore
+from model.utils.json_stat_decoder import (  # type: ignore
+    JSONStatCube,
+    JSONStatDimension,
+    decodeJSONStat,
+)
+from model.utils.request_builder import (  # type: ignore
+    STATFI_BASE_URL,
+    createSTATFITableObject,
+)
+
+
+class _Table:
+    # Values of every figure (rows) in every year (columns), NaN where missing.
+    values: np.ndarray
+    figure_ids: np.ndarray
+    figure_labels: np.ndarray
+    years: np.ndarray
+    # Seconds since the epoch, and the validators of the response if any.
+    fetched: float
+    etag: str
+    last_modified: str
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        figure_ids: np.ndarray,
+        figure_labels: np.ndarray,
+        years: np.ndarray,
+        fetched: float,
+        etag: str = "",
+        last_modified: str = "",
+    ):
+        self.values = values
+        self.figure_ids = figure_ids
+        self.figure_labels = figure_labels
+        self.years = years
+        self.fetched = fetched
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class STATFISnapshot:
+    """The whole STATFI table, downloaded once and kept on disk as a dense
+    figure by year cube. Any selection of figures and years is answered from
+    it locally, as a slice of the cube. A snapshot older
+    than max_age is refreshed with a conditional request.
+    """
+
+    _path: str
+    _max_age: float
+    _table: Optional[_Table]
+    _is_loaded: bool
+    _lock: threading.Lock
+    # Held while downloading, so the table is downloaded once at a time.
+    _download_lock: threading.Lock
+
+    def __init__(
+        self,
+        path: str = consts.STATFI_SNAPSHOT_FILE,
+        max_age: float = consts.STATFI_SNAPSHOT_MAX_AGE,
+    ):
+        self._path = path
+        self._max_age = max_age
+        self._table = None
+        self._is_loaded = False
+        self._lock = threading.Lock()
+        self._download_lock = threading.Lock()
+
+    def getCube(self, options: STATFIOptions) -> Optional[JSONStatCube]:
+        """The selected figures (Tiedot) by the selected years (Vuosi), or None
+        when there is no snapshot and it could not be downloaded, or it lacks
+        some of the figures or years, e.g. ones published after it. An old
+        snapshot is used as is.
+        """
+        table = self._getTable()
+        if table is None:
+            self.refresh()
+            table = self._getTable()
+        if (
+            table is None
+            or not np.isin(options.figure_ids, table.figure_ids).all()
+            or not np.isin(options.years, table.years).all()
+        ):
+            return None
+
+        # Figures and years are kept in the order of the table, like STATFI does.
+        rows = np.flatnonzero(np.isin(table.figure_ids, options.figure_ids))
+        columns = np.flatnonzero(np.isin(table.years, options.years))
+        return JSONStatCube(
+            table.values[np.ix_(rows, columns)],
+            [
+                JSONStatDimension(
+                    "Tiedot",
+                    tuple(str(figure_id) for figure_id in table.figure_ids[rows]),
+                    tuple(str(label) for label in table.figure_labels[rows]),
+                ),
+                JSONStatDimension(
+                    "Vuosi",
+                    tuple(str(year) for year in table.years[columns]),
+                    tuple(str(year) for year in table.years[columns]),
+                ),
+            ],
+        )
+
+    def isStale(self) -> bool:
+        table = self._getTable()
+        return table is None or time.time() - table.fetched > self._max_age
+
+    def refresh(self, _=None) -> bool:
+        # Takes a parameter to be run as a fetch job. Returns whether the table
+        # changed, keeping the snapshot as it is if the request fails.
+        with self._download_lock:
+            if not self.isStale():
+                return False
+            table = self._getTable()
+            new_table = self._downloadTable(table)
+            if new_table is None:
+                return False
+            trySavingCacheFile(lambda: self._saveTable(new_table))
+            with self._lock:
+                self._table = new_table
+        return table is None or not (
+            np.array_equal(new_table.values, table.values, equal_nan=True)
+            and np.array_equal(new_table.figure_ids, table.figure_ids)
+            and np.array_equal(new_table.years, table.years)
+        )
+
+    def _getTable(self) -> Optional[_Table]:
+        with self._lock:
+            self._loadTable()
+            return self._table
+
+    def _downloadTable(self, table: Optional[_Table]) -> Optional[_Table]:
+        headers = {}
+        if table is not None:
+            if table.etag:
+                headers["If-None-Match"] = table.etag
+            if table.last_modified:
+                headers["If-Modified-Since"] = table.last_modified
+        try:
+            response_API = HTTP_SESSIONS.post(
+                STATFI_BASE_URL, json=createSTATFITableObject(), headers=headers
+            )
+        except requests.exceptions.RequestException:
+            return None
+
+        if response_API.status_code == 304 and table is not None:
+            return _Table(
+                table.values,
+                table.figure_ids,
+                table.figure_labels,
+                table.years,
+                time.time(),
+                table.etag,
+                table.last_modified,
+            )
+        if response_API.status_code != 200:
+            return None
+        try:
+            new_table = self._decodeTable(response_API.json())
+        except (ValueError, KeyError, TypeError, IndexError):
+            return None
+        new_table.etag = response_API.headers.get("ETag", "")
+        new_table.last_modified = response_API.headers.get("Last-Modified", "")
+        return new_table
+
+    def _decodeTable(self, data: dict[str, Any]) -> _Table:
+        cube = decodeJSONStat(data).transpose(["Tiedot", "Vuosi"])
+        figure_dimension, year_dimension = cube.dimensions
+        return _Table(
+            np.ascontiguousarray(cube.values),
+            np.array(figure_dimension.ids),
+            np.array(figure_dimension.labels),
+            np.array(year_dimension.ids),
+            time.time(),
+        )
+
+    def _loadTable(self):
+        if self._is_loaded:
+            return
+        self._is_loaded = True
+        try:
+            with np.load(self._path) as cached:
+                self._table = _Table(
+                    cached["values"],
+                    cached["figure_ids"],
+                    cached["figure_labels"],
+                    cached["years"],
+                    float(cached["fetched"]),
+                    str(cached["etag"]),
+                    str(cached["last_modified"]),
+                )
+        except (OSError, KeyError, ValueError):
+            # Missing or unreadable snapshot, downloaded when first needed.
+            self._table = None
+
+    def _saveTable(self, table: _Table):
+        # Processes saving it at the same time download the same table, so the
+        # last one written is kept.
+        with replaceCacheFile(self._path) as snapshot_file:
+            np.savez(
+                snapshot_file,
+                values=table.values,
+                figure_ids=table.figure_ids,
+                figure_labels=table.figure_labels,
+                years=table.years,
+                fetched=table.fetched,
+                etag=table.etag,
+                last_modified=table.last_modified,
+            )
+
+
+STATFI_SNAPSHOT = STATFISnapshot()
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def lockCacheFile(path: str) -> Iterator[None]:
+    # Held while a cache file is read, merged and written, so that processes
+    # sharing the cache, e.g. the workers of cli.py, don't lose each other's
+    # updates. Locks <path>.lock, which is left in place.
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a+b") as lock_file:
+        if sys.platform == "win32":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def replaceCacheFile(path: str) -> Iterator[IO[bytes]]:
+    # The file is written under a unique temporary name in the same directory and
+    # moved over path once complete, so a partly written file is never read.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as cache_file:
+            yield cache_file
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+
+def trySavingCacheFile(save: Callable[[], Any]) -> bool:
+    # The caches only save fetching again, so a cache file that can't be written,
+    # e.g. in a read-only directory or on a full disk, is left unsaved and the
+    # data is kept in memory. Returns whether it was saved.
+    try:
+        save()
+    except OSError:
+        return False
+    return True
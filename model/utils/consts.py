@@ -1,6 +1,13 @@
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
 StationsDict = dict[str, dict[str, dict[str, str]]]
 
 OPTIONS_DIRECTORY = "./options"
+CACHE_DIRECTORY = "./cache"
+SMEAR_CACHE_DIRECTORY = f"{CACHE_DIRECTORY}/SMEAR"
+SMEAR_METADATA_CACHE_FILE = f"{CACHE_DIRECTORY}/SMEAR_metadata.json"
+STATFI_SNAPSHOT_FILE = f"{CACHE_DIRECTORY}/STATFI/Kokodata.npz"
 
 ALL_SMEAR_STATIONS: StationsDict = {
     "Värriö": {
@@ -35,6 +42,35 @@ ALL_SMEAR_STATIONS: StationsDict = {
     },
 }
 
+
+class SMEARVariable(NamedTuple):
+    station: str
+    gas: str
+    table: str
+    variable: str
+
+    @property
+    def tablevariable(self) -> str:
+        return f"{self.table}.{self.variable}"
+
+
+def _createSMEARVariables() -> list[SMEARVariable]:
+    return [
+        SMEARVariable(station, gas, gas_info["table"], gas_info["variable"])
+        for station, gases in ALL_SMEAR_STATIONS.items()
+        for gas, gas_info in gases.items()
+    ]
+
+
+# Read-only indices of ALL_SMEAR_STATIONS for constant time lookups, by
+# "<table>.<variable>" id as used in the SMEAR API and by (station, gas).
+SMEAR_VARIABLES_BY_TABLEVARIABLE: Mapping[str, SMEARVariable] = MappingProxyType(
+    {variable.tablevariable: variable for variable in _createSMEARVariables()}
+)
+SMEAR_VARIABLES_BY_STATION: Mapping[tuple[str, str], SMEARVariable] = MappingProxyType(
+    {(variable.station, variable.gas): variable for variable in _createSMEARVariables()}
+)
+
 # Store the title as keys because the UI shows the titles, and we need to convert
 # titles to ids.
 ALL_STATFI_LABELS: dict[str, str] = {
@@ -46,5 +82,42 @@ ALL_STATFI_LABELS: dict[str, str] = {
 
 NETWORK_ERROR_MSG: str = "Network error, check your connection"
 
+# Connections kept alive per host, and timeouts (seconds) of a single request.
+HTTP_POOL_SIZE: int = 8
+HTTP_CONNECT_TIMEOUT: float = 10
+HTTP_READ_TIMEOUT: float = 60
+# Requests issued at the same time by a single fetch, e.g. the years of a comparison.
+MAX_CONCURRENT_FETCHES: int = 4
+# Fetch jobs of the tabs running against the same host at a time. Jobs beyond this
+# wait in the queue of the fetch scheduler.
+FETCH_MAX_JOBS_PER_HOST: int = 2
+# Cached metadata of SMEAR variables, e.g. the periods they have data for, is
+# fetched again after this many seconds.
+SMEAR_METADATA_TTL: float = 24 * 60 * 60
+
+# Larger SMEAR requests (rows times stations) are split into time windows.
+SMEAR_MAX_ROWS_PER_REQUEST: int = 200_000
+# Non-aggregated SMEAR data is assumed to be sampled once per minute.
+SMEAR_RAW_RESOLUTION_MINUTES: int = 1
+# Up to this many rows, raw SMEAR data is aggregated locally, so that changing the
+# aggregation method does not need a new request. Raw data is only fetched for it
+# up to SMEAR_MAX_RAW_FETCH_ROWS, larger ranges use it when it is already cached.
+SMEAR_MAX_LOCAL_RESAMPLE_ROWS: int = 200_000
+SMEAR_MAX_RAW_FETCH_ROWS: int = 20_000
+# When the SMEAR plot is zoomed in, the visible range is refined to the finest of
+# these intervals (minutes) that gives at most SMEAR_ZOOM_MAX_POINTS samples per
+# station, once the view has not changed for SMEAR_ZOOM_REFINE_DELAY_MS.
+SMEAR_ZOOM_INTERVALS: tuple[int, ...] = (1, 5, 10, 15, 30, 60, 180, 360, 720, 1440)
+SMEAR_ZOOM_MAX_POINTS: int = 2000
+SMEAR_ZOOM_REFINE_DELAY_MS: int = 300
+# Interval (minutes) of the SMEAR averages the yearly averages of the comparison
+# tab are computed from.
+SMEAR_COMPARE_AVERAGE_INTERVAL: str = "1440"
+
 YEAR_START_STATFI_DATA: int = 1990
 YEAR_END_STATFI_DATA: int = 2017
+# STATFI selections are answered from a local snapshot of the whole table, which
+# is refreshed in the background once it is older than STATFI_SNAPSHOT_MAX_AGE
+# seconds. Without the snapshot, every selection is queried from STATFI.
+USE_STATFI_SNAPSHOT: bool = True
+STATFI_SNAPSHOT_MAX_AGE: float = 7 * 24 * 60 * 60
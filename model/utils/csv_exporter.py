@@ -0,0 +1,36 @@
+import csv
+from typing import Iterable
+
+import numpy as np
+
+from model.data_models.figure import Figure
+from model.data_models.station import Station
+
+
+def writeStationsCSV(file_name: str, stations: Iterable[Station]):
+    # One row per sample, timestamps in ISO 8601 and missing values left empty.
+    with open(file_name, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["station", "timestamp", "concentration"])
+        for station in stations:
+            timestamps = np.datetime_as_string(station.getTimeStampsArray(), unit="s")
+            concentrations = station.getConcentrationsArray()
+            writer.writerows(
+                [station.getName(), timestamp, _formatValue(value)]
+                for timestamp, value in zip(timestamps, concentrations)
+            )
+
+
+def writeFiguresCSV(file_name: str, figures: Iterable[Figure]):
+    with open(file_name, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["figure", "year", "value"])
+        for figure in figures:
+            writer.writerows(
+                [figure.getNameText(), int(year), _formatValue(value)]
+                for year, value in zip(figure.getYearsArray(), figure.getValuesArray())
+            )
+
+
+def _formatValue(value: float) -> str:
+    return "" if np.isnan(value) else repr(float(value))
@@ -1,6 +1,8 @@
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Any, Optional, Union
 from datetime import datetime
-from PyQt6.QtCore import QRunnable, QMetaObject, Qt, Q_ARG
+import numpy as np
 import requests
 from model.data_models.user_options import (
     CompareOptions,
@@ -11,10 +13,27 @@ from model.data_models.user_options import (
 )
 from model.utils.request_builder import (  # type: ignore
     STATFI_BASE_URL,
+    createSMEARTimeWindows,
     createSMEARUrl,
+    createSMEARVariableUrl,
     createSTATFIDataObject,
+    getSMEARRequestInterval,
 )
 from model.utils import consts  # type: ignore
+from model.utils.http_session import HTTP_SESSIONS  # type: ignore
+from model.utils.SMEAR_parser import (  # type: ignore
+    SMEAR_STREAM_CHUNK_SIZE,
+    parseSMEARResponse,
+)
+from model.utils.SMEAR_cache import (  # type: ignore
+    SMEARCache,
+    cachedColumnsToSMEARData,
+    mergeIntervals,
+)
+from model.utils.json_stat_decoder import JSONStatCube  # type: ignore
+from model.utils.STATFI_snapshot import STATFI_SNAPSHOT  # type: ignore
+
+_SMEAR_cache = SMEARCache()
 
 
 def createErrorDict(message: str) -> dict[str, str]:
@@ -23,37 +42,205 @@ def createErrorDict(message: str) -> dict[str, str]:
     return error
 
 
+def isErrorDict(data: Any) -> bool:
+    # STATFI data can also be a JSONStatCube, which is never an error.
+    return isinstance(data, dict) and "error_message" in data
+
+
 class DataFetcher:
     @staticmethod
-    def fetchSMEARData(options: SMEAROptions) -> dict[str, Any]:
+    def fetchSMEARData(
+        options: SMEAROptions, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
         # Can be empty when loaded from a json.
         if not options.stations:
             return {}
+        aggregation = options.aggregation_method.value
+        interval = getSMEARRequestInterval(options)
+        tablevariables = [
+            f"{table}.{variable}"
+            for table, variable in zip(options.table_names, options.variable_names)
+        ]
+        missing_intervals = {
+            station: _SMEAR_cache.getMissingIntervals(
+                tablevariable,
+                aggregation,
+                interval,
+                options.start_date_time,
+                options.end_date_time,
+            )
+            for station, tablevariable in zip(options.stations, tablevariables)
+        }
+
+        # Only the parts not in the cache are fetched, for the stations missing them.
+        all_missing_intervals = [
+            interval
+            for intervals in missing_intervals.values()
+            for interval in intervals
+        ]
+        for gap_start, gap_end in mergeIntervals(all_missing_intervals):
+            gap_options = replace(
+                options,
+                start_date_time=gap_start,
+                end_date_time=gap_end,
+                stations=[
+                    station
+                    for station, intervals in missing_intervals.items()
+                    if any(
+                        start < gap_end and gap_start < end for start, end in intervals
+                    )
+                ],
+            )
+            gap_data = DataFetcher._requestSMEARDataInWindows(gap_options, timeout)
+            if "error_message" in gap_data:
+                return gap_data
+            DataFetcher._storeSMEARData(gap_options, gap_data)
+
+        cached = [
+            _SMEAR_cache.load(
+                tablevariable,
+                aggregation,
+                interval,
+                options.start_date_time,
+                options.end_date_time,
+            )
+            for tablevariable in tablevariables
+        ]
+        return cachedColumnsToSMEARData(tablevariables, cached)
+
+    @staticmethod
+    def isSMEARDataCached(options: SMEAROptions) -> bool:
+        return not any(
+            _SMEAR_cache.getMissingIntervals(
+                f"{table}.{variable}",
+                options.aggregation_method.value,
+                getSMEARRequestInterval(options),
+                options.start_date_time,
+                options.end_date_time,
+            )
+            for table, variable in zip(options.table_names, options.variable_names)
+        )
+
+    @staticmethod
+    def _requestSMEARDataInWindows(
+        options: SMEAROptions, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        windows = createSMEARTimeWindows(options)
+        if len(windows) == 1:
+            return DataFetcher._requestSMEARData(options, timeout)
+
+        with ThreadPoolExecutor(max_workers=consts.MAX_CONCURRENT_FETCHES) as executor:
+            windows_data = list(
+                executor.map(
+                    lambda window: DataFetcher._requestSMEARData(
+                        replace(
+                            options, start_date_time=window[0], end_date_time=window[1]
+                        ),
+                        timeout,
+                    ),
+                    windows,
+                )
+            )
+        for window_data in windows_data:
+            if "error_message" in window_data:
+                return window_data
+
+        stitched_data = dict(windows_data[0])
+        columns: list[str] = list(
+            dict.fromkeys(
+                column
+                for window_data in windows_data
+                for column in window_data["columns"]
+            )
+        )
+        samptimes: list[np.ndarray] = []
+        values: dict[str, list[np.ndarray]] = {column: [] for column in columns}
+        window_ends = [np.datetime64(start, "ms") for start, _ in windows[1:]] + [None]
+        for window_data, window_end in zip(windows_data, window_ends):
+            window_samptimes = window_data["samptimes"]
+            # Consecutive windows share a boundary. Rows are labelled by the start of
+            # their bucket, so the row at the boundary is kept from the later window.
+            kept = (
+                window_samptimes < window_end
+                if window_end is not None
+                else np.ones(len(window_samptimes), dtype=bool)
+            )
+            samptimes.append(window_samptimes[kept])
+            for column in columns:
+                column_values = window_data["values"].get(column)
+                values[column].append(
+                    column_values[kept]
+                    if column_values is not None
+                    else np.full(np.count_nonzero(kept), np.nan)
+                )
+        stitched_data["columns"] = columns
+        stitched_data["samptimes"] = np.concatenate(samptimes)
+        stitched_data["values"] = {
+            column: np.concatenate(column_values)
+            for column, column_values in values.items()
+        }
+        return stitched_data
+
+    @staticmethod
+    def _requestSMEARData(
+        options: SMEAROptions, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
         url = createSMEARUrl(options)
         try:
-            response_API = requests.get(url)
+            with HTTP_SESSIONS.get(url, timeout=timeout, stream=True) as response_API:
+                status_code = response_API.status_code
+                # TODO: If error occurs, warns the user through the UI
+                if status_code >= 400 and status_code <= 599:
+                    error_dict = createErrorDict(
+                        "GET request to SMEAR failed with status code: "
+                        + str(status_code)
+                    )
+                    return error_dict
+                # The body is decoded while it downloads, directly into columns.
+                return parseSMEARResponse(
+                    response_API.iter_content(chunk_size=SMEAR_STREAM_CHUNK_SIZE)
+                )
         except requests.exceptions.RequestException as e:
             error_dict = createErrorDict(consts.NETWORK_ERROR_MSG)
             return error_dict
+        except (ValueError, TypeError):
+            # A malformed body or a non-numeric value.
+            error_dict = createErrorDict("Could not parse the response from SMEAR")
+            return error_dict
 
-        status_code = response_API.status_code
-        # TODO: If error occurs, warns the user through the UI
-        if status_code >= 400 and status_code <= 599:
-            error_dict = createErrorDict(
-                "GET request to SMEAR failed with status code: " + str(status_code)
+    @staticmethod
+    def _storeSMEARData(options: SMEAROptions, data: dict[str, Any]):
+        # Data newer than now may still arrive, so it is not marked as covered.
+        covered = (
+            options.start_date_time,
+            min(options.end_date_time, datetime.now()),
+        )
+        for tablevariable in data.get("columns", []):
+            _SMEAR_cache.store(
+                tablevariable,
+                options.aggregation_method.value,
+                getSMEARRequestInterval(options),
+                covered,
+                data["samptimes"],
+                data["values"][tablevariable],
             )
-            return error_dict
-        return response_API.json()
 
     @staticmethod
-    def fetchSTATFIData(options: STATFIOptions) -> dict[str, Any]:
+    def fetchSTATFIData(
+        options: STATFIOptions, timeout: Optional[float] = None
+    ) -> Union[dict[str, Any], JSONStatCube]:
+        # A slice of the snapshot, or the json-stat2 response of a live query.
         # Can be empty when loaded from a json.
         if not options.figure_names or not options.years:
             return {}
+        if consts.USE_STATFI_SNAPSHOT:
+            cube = STATFI_SNAPSHOT.getCube(options)
+            if cube is not None:
+                return cube
         url = STATFI_BASE_URL
         request_object = createSTATFIDataObject(options)
         try:
-            response_API = requests.post(url, json=request_object)
+            response_API = HTTP_SESSIONS.post(url, json=request_object, timeout=timeout)
         except requests.exceptions.RequestException as e:
             error_dict = createErrorDict(consts.NETWORK_ERROR_MSG)
             return error_dict
@@ -69,7 +256,11 @@ class DataFetcher:
         return response_API.json()
 
     @staticmethod
-    def fetchComparisonData(options: CompareOptions) -> dict[str, Any]:
+    def fetchComparisonData(
+        options: CompareOptions,
+        max_workers: int = consts.MAX_CONCURRENT_FETCHES,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
         if (
             not options.STATFI_figure_names
             or not options.STATFI_years
@@ -78,36 +269,48 @@ class DataFetcher:
         ):
             return {}
 
-        compare_data: dict[str, list[dict[str, Any]]] = {}
+        compare_data: dict[str, list[Any]] = {}
 
-        compare_data["STATFI"] = [
-            DataFetcher.fetchSTATFIData(
+        # The STATFI query and every SMEAR year are fetched concurrently, the
+        # results are collected in year order.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            STATFI_future = executor.submit(
+                DataFetcher.fetchSTATFIData,
                 STATFIOptions(
                     figure_names=options.STATFI_figure_names,
                     years=options.STATFI_years,
                     plot_type=STATFIPlotType.BAR_CHART,
-                )
+                ),
+                timeout,
             )
-        ]
 
-        SMEAR_data = []
-        options.SMEAR_years.sort()
-        for year in options.SMEAR_years:
-            start_date_time = datetime(int(year), 1, 1, 0, 0, 0)
-            end_date_time = datetime(int(year), 12, 31, 23, 59, 59)
-
-            SMEAR_data.append(
-                DataFetcher.fetchSMEARData(
-                    SMEAROptions(
-                        gas=options.SMEAR_gas,
-                        aggregation_method=SMEARAggregation.AVG,
-                        start_date_time=start_date_time,
-                        end_date_time=end_date_time,
-                        stations=options.SMEAR_stations,
+            SMEAR_futures = []
+            is_breakdown = options.isBreakdown()
+            options.SMEAR_years.sort()
+            for year in options.SMEAR_years:
+                start_date_time = datetime(int(year), 1, 1, 0, 0, 0)
+                end_date_time = datetime(int(year), 12, 31, 23, 59, 59)
+                SMEAR_options = SMEAROptions(
+                    gas=options.SMEAR_gas,
+                    aggregation_method=SMEARAggregation.AVG,
+                    start_date_time=start_date_time,
+                    end_date_time=end_date_time,
+                    stations=options.SMEAR_stations,
+                )
+                # Yearly averages are always taken from daily averages, a few
+                # hundred rows per station, so that they don't depend on what
+                # is cached.
+                if not is_breakdown:
+                    SMEAR_options = replace(
+                        SMEAR_options, interval=consts.SMEAR_COMPARE_AVERAGE_INTERVAL
                     )
+
+                SMEAR_futures.append(
+                    executor.submit(DataFetcher.fetchSMEARData, SMEAR_options, timeout)
                 )
-            )
-        compare_data["SMEAR"] = SMEAR_data
+
+            compare_data["STATFI"] = [STATFI_future.result()]
+            compare_data["SMEAR"] = [future.result() for future in SMEAR_futures]
         return compare_data
 
     @staticmethod
@@ -118,7 +321,7 @@ class DataFetcher:
             table=options["table"], variable=options["variable"]
         )
         try:
-            response_API = requests.get(url)
+            response_API = HTTP_SESSIONS.get(url)
         except requests.exceptions.RequestException as e:
             error_dict = createErrorDict(consts.NETWORK_ERROR_MSG)
             return error_dict
@@ -132,20 +335,29 @@ class DataFetcher:
         # SMEAR tab handler only cares about first data in the array.
         return response_API.json()[0]
 
+    @staticmethod
+    def fetchSMEARVariablesMetadata(tablevariables: list[str]) -> dict[str, Any]:
+        # Metadata of several variables in one request, by "<table>.<variable>".
+        # Variables missing from the response are left out.
+        if not tablevariables:
+            return {}
+        try:
+            response_API = HTTP_SESSIONS.get(createSMEARVariableUrl(tablevariables))
+        except requests.exceptions.RequestException:
+            return createErrorDict(consts.NETWORK_ERROR_MSG)
 
-class DataFetcherWrapper(QRunnable):
-    def __init__(self, owner, callable, param, callback):
-        QRunnable.__init__(self)
-        self._owner = owner
-        self._callable = callable
-        self._param = param
-        self._callback = callback
-
-    def run(self):
-        data = self._callable(self._param)
-        QMetaObject.invokeMethod(
-            self._owner,
-            self._callback,
-            Qt.ConnectionType.QueuedConnection,
-            Q_ARG(dict, data),
-        )
+        status_code = response_API.status_code
+        if status_code >= 400 and status_code <= 599:
+            return createErrorDict(
+                "GET request to SMEAR failed with status code: " + str(status_code)
+            )
+        try:
+            variables = response_API.json()
+        except ValueError:
+            return createErrorDict("Could not parse the response from SMEAR")
+        metadata = {}
+        for variable in variables:
+            tablevariable = f"{variable.get('tableName')}.{variable.get('name')}"
+            if tablevariable in tablevariables:
+                metadata[tablevariable] = variable
+        return metadata
@@ -0,0 +1,21 @@
+from PyQt6.QtCore import QRunnable, QMetaObject, Qt, Q_ARG
+
+
+class DataFetcherWrapper(QRunnable):
+    def __init__(self, owner, callable, param, callback):
+        QRunnable.__init__(self)
+        self._owner = owner
+        self._callable = callable
+        self._param = param
+        self._callback = callback
+
+    def run(self):
+        # The result is passed on as the Python object itself, so everything
+        # built here is handed to the callback without being converted.
+        data = self._callable(self._param)
+        QMetaObject.invokeMethod(
+            self._owner,
+            self._callback,
+            Qt.ConnectionType.QueuedConnection,
+            Q_ARG(object, data),
+        )
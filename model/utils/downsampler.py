@@ -0,0 +1,106 @@
+import numpy as np
+
+from model.data_models.station import Station
+from model.data_models.user_options import DownsamplingMethod
+
+
+def downsample(
+    x: np.ndarray, y: np.ndarray, width: int, method: DownsamplingMethod
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a line to about as many points as can be told apart on a plot of
+    width pixels. x has to be sorted and can be numeric or datetime64.
+    """
+    if method == DownsamplingMethod.NONE:
+        return x, y
+    x_numeric = _toNumeric(x)
+    if method == DownsamplingMethod.LTTB:
+        indices = largestTriangleThreeBucketsIndices(x_numeric, y, width)
+    elif method == DownsamplingMethod.MIN_MAX:
+        indices = minMaxEnvelopeIndices(x_numeric, y, width)
+    else:
+        raise ValueError(f"Unknown downsampling method {method}")
+    return x[indices], y[indices]
+
+
+def downsampleStation(
+    station: Station, width: int, method: DownsamplingMethod
+) -> tuple[np.ndarray, np.ndarray]:
+    """Like downsample, but the min/max envelope is read from the summary
+    pyramid of the station instead of scanning every sample.
+    """
+    time_stamps = station.getTimeStampsArray()
+    concentrations = station.getConcentrationsArray()
+    if method != DownsamplingMethod.MIN_MAX:
+        return downsample(time_stamps, concentrations, width, method)
+    indices = station.getSummaryPyramid().getEnvelopeIndices(width)
+    return time_stamps[indices], concentrations[indices]
+
+
+def largestTriangleThreeBucketsIndices(
+    x: np.ndarray, y: np.ndarray, threshold: int
+) -> np.ndarray:
+    # Keeps the first and last point and, from each of threshold - 2 buckets, the
+    # point forming the largest triangle with the previously kept point and the
+    # average of the next bucket.
+    point_count = len(y)
+    if threshold >= point_count or threshold < 3:
+        return np.arange(point_count)
+
+    x = x - x[0]
+    bucket_size = (point_count - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    previous = 0
+    for bucket in range(threshold - 2):
+        average_start = int((bucket + 1) * bucket_size) + 1
+        average_end = min(int((bucket + 2) * bucket_size) + 1, point_count)
+        average_x = x[average_start:average_end].mean()
+        average_y = y[average_start:average_end].mean()
+
+        range_start = int(bucket * bucket_size) + 1
+        range_end = int((bucket + 1) * bucket_size) + 1
+        areas = np.abs(
+            (x[previous] - average_x) * (y[range_start:range_end] - y[previous])
+            - (x[previous] - x[range_start:range_end]) * (average_y - y[previous])
+        )
+        previous = range_start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    indices[-1] = point_count - 1
+    return indices
+
+
+def minMaxEnvelopeIndices(x: np.ndarray, y: np.ndarray, pixel_count: int) -> np.ndarray:
+    # Keeps the minimum and the maximum of every pixel column, which preserves
+    # the drawn envelope of the line exactly.
+    point_count = len(y)
+    if point_count <= 2 * pixel_count or x[-1] == x[0]:
+        return np.arange(point_count)
+
+    columns = ((x - x[0]) * (pixel_count / (x[-1] - x[0]))).astype(np.int64)
+    columns = np.minimum(columns, pixel_count - 1)
+    starts = np.flatnonzero(np.diff(columns, prepend=-1))
+    lengths = np.diff(np.append(starts, point_count))
+    column_of_point = np.repeat(np.arange(len(starts)), lengths)
+    minimum_positions = _getFirstPositionsPerColumn(
+        y == np.repeat(np.minimum.reduceat(y, starts), lengths), column_of_point
+    )
+    maximum_positions = _getFirstPositionsPerColumn(
+        y == np.repeat(np.maximum.reduceat(y, starts), lengths), column_of_point
+    )
+    return np.unique(
+        np.concatenate([minimum_positions, maximum_positions, [0, point_count - 1]])
+    )
+
+
+def _getFirstPositionsPerColumn(
+    is_selected: np.ndarray, column_of_point: np.ndarray
+) -> np.ndarray:
+    positions = np.flatnonzero(is_selected)
+    _, first_indices = np.unique(column_of_point[positions], return_index=True)
+    return positions[first_indices]
+
+
+def _toNumeric(x: np.ndarray) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
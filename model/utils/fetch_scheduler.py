@@ -0,0 +1,160 @@
+import heapq
+import itertools
+from enum import IntEnum
+from typing import Any, Callable, Hashable, Iterable
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from model.data_models.fetch_results import FetchFailure
+from model.utils import consts  # type: ignore
+
+
+class FetchPriority(IntEnum):
+    # Jobs with a higher priority are started first.
+    PREFETCH = 0
+    METADATA = 1
+    VISIBLE = 2
+
+
+class _FetchJob(QRunnable):
+    tag: Hashable
+    priority: FetchPriority
+    hosts: tuple[str, ...]
+    is_cancelled: bool
+
+    def __init__(
+        self,
+        scheduler: "FetchScheduler",
+        tag: Hashable,
+        callable: Callable[[Any], Any],
+        param: Any,
+        owner: QObject,
+        callback: str,
+        priority: FetchPriority,
+        hosts: tuple[str, ...],
+    ):
+        QRunnable.__init__(self)
+        # The scheduler keeps the job until it has finished.
+        self.setAutoDelete(False)
+        self._scheduler = scheduler
+        self._callable = callable
+        self._param = param
+        self.owner = owner
+        self.callback = callback
+        self.tag = tag
+        self.priority = priority
+        self.hosts = hosts
+        self.is_cancelled = False
+
+    def run(self):
+        data: Any = None
+        if not self.is_cancelled:
+            try:
+                data = self._callable(self._param)
+            except Exception as error:
+                # Raised here it would abort the app and leave the job running.
+                data = FetchFailure(f"The request failed: {error}")
+        # Queued to the scheduler in the GUI thread.
+        self._scheduler.job_finished.emit(self, data)
+
+
+class FetchScheduler(QObject):
+    """Runs fetch jobs in the global QThreadPool. Jobs are tagged, e.g. by tab
+    and purpose, and a new job supersedes the jobs with the same tag: those
+    still queued are dropped and the results of those running are discarded,
+    so their callbacks never fire. Queued jobs are started by priority, with at
+    most max_jobs_per_host jobs running against the same host at a time.
+    """
+
+    job_finished = pyqtSignal(object, object)
+
+    _max_jobs_per_host: int
+    _queue: list[tuple[int, int, _FetchJob]]
+    _running: set[_FetchJob]
+    _jobs_per_host: dict[str, int]
+    _order: "itertools.count[int]"
+
+    def __init__(
+        self, max_jobs_per_host: int = consts.FETCH_MAX_JOBS_PER_HOST, parent=None
+    ):
+        super().__init__(parent)
+        self._max_jobs_per_host = max_jobs_per_host
+        self._queue = []
+        self._running = set()
+        self._jobs_per_host = {}
+        self._order = itertools.count()
+        self.job_finished.connect(self._onJobFinished)
+
+    def schedule(
+        self,
+        tag: Hashable,
+        callable: Callable[[Any], Any],
+        param: Any,
+        owner: QObject,
+        callback: str,
+        priority: FetchPriority = FetchPriority.VISIBLE,
+        hosts: Iterable[str] = (),
+        supersede: bool = True,
+    ):
+        """Run callable(param) in a worker thread and pass its result, or a
+        FetchFailure if it raised, to the slot named callback of owner. Unless
+        supersede is unset, the jobs with the same tag are cancelled first.
+        """
+        if supersede:
+            self.cancel(tag)
+        job = _FetchJob(
+            self, tag, callable, param, owner, callback, priority, tuple(hosts)
+        )
+        # Ties are started in the order they were scheduled.
+        heapq.heappush(self._queue, (-priority, next(self._order), job))
+        self._startJobs()
+
+    def cancel(self, tag: Hashable):
+        self._queue = [entry for entry in self._queue if entry[2].tag != tag]
+        heapq.heapify(self._queue)
+        for job in self._running:
+            if job.tag == tag:
+                job.is_cancelled = True
+
+    def getQueueDepth(self) -> dict[str, int]:
+        # For diagnostics: jobs waiting, jobs running and, of those, the ones
+        # whose results will be discarded.
+        return {
+            "queued": len(self._queue),
+            "running": len(self._running),
+            "cancelled": sum(job.is_cancelled for job in self._running),
+        }
+
+    def getJobsPerHost(self) -> dict[str, int]:
+        return {host: count for host, count in self._jobs_per_host.items() if count}
+
+    @pyqtSlot(object, object)
+    def _onJobFinished(self, job: _FetchJob, data: Any):
+        self._running.discard(job)
+        for host in job.hosts:
+            self._jobs_per_host[host] -= 1
+        if not job.is_cancelled:
+            getattr(job.owner, job.callback)(data)
+        self._startJobs()
+
+    def _startJobs(self):
+        # Jobs whose hosts are busy wait, without holding up the ones after them.
+        waiting = []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if any(
+                self._jobs_per_host.get(host, 0) >= self._max_jobs_per_host
+                for host in job.hosts
+            ):
+                waiting.append(entry)
+                continue
+            for host in job.hosts:
+                self._jobs_per_host[host] = self._jobs_per_host.get(host, 0) + 1
+            self._running.add(job)
+            QThreadPool.globalInstance().start(job, int(job.priority))
+        for entry in waiting:
+            heapq.heappush(self._queue, entry)
+
+
+FETCH_SCHEDULER = FetchScheduler()
@@ -0,0 +1,40 @@
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+
+class GUIBlockMonitor(QObject):
+    """Measures how long the GUI thread is kept from processing events, from the
+    delay of a timer that should fire on it every interval_ms milliseconds.
+    """
+
+    _timer: QTimer
+    _last_timeout: float
+    _max_block_time: float
+
+    def __init__(self, interval_ms: int = 5, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._onTimeout)
+        self._last_timeout = 0.0
+        self._max_block_time = 0.0
+
+    def start(self):
+        self._max_block_time = 0.0
+        self._last_timeout = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def getMaxBlockTime(self) -> float:
+        # Longest time in milliseconds the timer was late by since start.
+        return self._max_block_time
+
+    def _onTimeout(self):
+        now = time.perf_counter()
+        block_time = (now - self._last_timeout) * 1000 - self._timer.interval()
+        self._max_block_time = max(self._max_block_time, block_time)
+        self._last_timeout = now
@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from model.utils import consts  # type: ignore
+
+
+class HTTPSessionPool:
+    """Keep-alive sessions shared by all fetches, one per host. The connection
+    pools of requests are thread-safe, so the same session is used from every
+    QThreadPool worker instead of opening a new connection per request.
+    """
+
+    _pool_size: int
+    _timeout: tuple[float, float]
+    _sessions: dict[str, requests.Session]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        pool_size: int = consts.HTTP_POOL_SIZE,
+        connect_timeout: float = consts.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = consts.HTTP_READ_TIMEOUT,
+    ):
+        self._pool_size = pool_size
+        self._timeout = (connect_timeout, read_timeout)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        return self._getSession(url).get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        return self._getSession(url).post(url, **kwargs)
+
+    def configure(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        with self._lock:
+            if pool_size is not None:
+                self._pool_size = pool_size
+            self._timeout = (
+                self._timeout[0] if connect_timeout is None else connect_timeout,
+                self._timeout[1] if read_timeout is None else read_timeout,
+            )
+            # Sessions are recreated with the new pool size on next use.
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+    def getConnectionStats(self) -> dict[str, dict[str, int]]:
+        stats: dict[str, dict[str, int]] = {}
+        with self._lock:
+            sessions = dict(self._sessions)
+        for host, session in sessions.items():
+            host_stats = {"requests": 0, "connections": 0, "reused": 0}
+            # The same adapter is mounted for both schemes.
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools  # type: ignore
+                for pool_key in pools.keys():
+                    pool = pools.get(pool_key)
+                    if pool is None:
+                        continue
+                    host_stats["requests"] += pool.num_requests
+                    host_stats["connections"] += pool.num_connections
+            host_stats["reused"] = max(
+                host_stats["requests"] - host_stats["connections"], 0
+            )
+            stats[host] = host_stats
+        return stats
+
+    def _getSession(self, url: str) -> requests.Session:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._createSession()
+            return self._sessions[host]
+
+    def _createSession(self) -> requests.Session:
+        session = requests.Session()
+        # Block instead of opening throwaway connections when the pool is in use.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self._pool_size, pool_block=True
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+HTTP_SESSIONS = HTTPSessionPool()
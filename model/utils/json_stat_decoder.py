@@ -0,0 +1,109 @@
+import math
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+
+
+class JSONStatDimension(NamedTuple):
+    name: str
+    # Category ids in the order of their index, and their labels.
+    ids: tuple[str, ...]
+    labels: tuple[str, ...]
+
+
+class JSONStatCube:
+    """Values of a json-stat2 dataset as an N-dimensional float64 array with one
+    axis per dimension, in the order of the "id" of the dataset. Missing values
+    are NaN.
+    """
+
+    values: np.ndarray
+    dimensions: tuple[JSONStatDimension, ...]
+
+    def __init__(self, values: np.ndarray, dimensions: Sequence[JSONStatDimension]):
+        self.values = values
+        self.dimensions = tuple(dimensions)
+
+    def getAxis(self, name: str) -> int:
+        for axis, dimension in enumerate(self.dimensions):
+            if dimension.name == name:
+                return axis
+        raise KeyError(name)
+
+    def getDimension(self, name: str) -> JSONStatDimension:
+        return self.dimensions[self.getAxis(name)]
+
+    def select(self, name: str, ids: Sequence[str]) -> "JSONStatCube":
+        # The categories of the dimension with the given ids, in the order given.
+        axis = self.getAxis(name)
+        dimension = self.dimensions[axis]
+        indices = [dimension.ids.index(category_id) for category_id in ids]
+        dimensions = list(self.dimensions)
+        dimensions[axis] = JSONStatDimension(
+            name,
+            tuple(dimension.ids[index] for index in indices),
+            tuple(dimension.labels[index] for index in indices),
+        )
+        return JSONStatCube(np.take(self.values, indices, axis=axis), dimensions)
+
+    def transpose(self, names: Sequence[str]) -> "JSONStatCube":
+        """A view with the axes of the named dimensions in the given order. The
+        other dimensions must have a single category, and are dropped.
+        """
+        axes = [self.getAxis(name) for name in names]
+        other_axes = [axis for axis in range(len(self.dimensions)) if axis not in axes]
+        if any(len(self.dimensions[axis].ids) != 1 for axis in other_axes):
+            raise ValueError(f"Only the dimensions {', '.join(names)} can vary")
+        return JSONStatCube(
+            self.values.transpose(axes + other_axes).reshape(
+                tuple(self.values.shape[axis] for axis in axes)
+            ),
+            [self.dimensions[axis] for axis in axes],
+        )
+
+
+def decodeJSONStat(data: dict[str, Any]) -> JSONStatCube:
+    """Decode a json-stat2 dataset, e.g. a STATFI response, into a cube. The
+    values are reshaped at once by the "size" of the dimensions.
+    """
+    sizes = [int(size) for size in data["size"]]
+    dimensions = [
+        _decodeDimension(name, data["dimension"][name]["category"], size)
+        for name, size in zip(data["id"], sizes)
+    ]
+    return JSONStatCube(
+        _decodeValues(data["value"], math.prod(sizes)).reshape(sizes), dimensions
+    )
+
+
+def _decodeDimension(
+    name: str, category: dict[str, Any], size: int
+) -> JSONStatDimension:
+    # The index is an object of positions by id, an array of ids, or left out
+    # for a dimension of a single category.
+    index = category.get("index")
+    labels = category.get("label", {})
+    if index is None:
+        ids = list(labels)
+    elif isinstance(index, dict):
+        ids = sorted(index, key=index.__getitem__)
+    else:
+        ids = list(index)
+    if len(ids) != size:
+        raise ValueError(f"Dimension {name} has {len(ids)} categories, not {size}")
+    return JSONStatDimension(
+        name,
+        tuple(ids),
+        tuple(str(labels.get(category_id, category_id)) for category_id in ids),
+    )
+
+
+def _decodeValues(value: Any, count: int) -> np.ndarray:
+    # An array of all the values, or an object of the values present by position.
+    if isinstance(value, dict):
+        values = np.full(count, np.nan)
+        if value:
+            positions = np.fromiter(value.keys(), dtype=np.int64, count=len(value))
+            values[positions] = np.array(list(value.values()), dtype=np.float64)
+        return values
+    return np.array(value, dtype=np.float64)
@@ -1,9 +1,21 @@
+import math
+from datetime import datetime, timedelta
 from typing import Any
-from model.data_models.user_options import SMEAROptions, STATFIOptions
+from urllib.parse import urlparse
+from model.data_models.user_options import (
+    SMEARAggregation,
+    SMEAROptions,
+    STATFIOptions,
+)
+from model.utils import consts  # type: ignore
 
 
 SMEAR_BASE_URL = "https://smear-backend.rahtiapp.fi/search/timeseries"
+SMEAR_VARIABLE_URL = "https://smear-backend.rahtiapp.fi/search/variable"
 STATFI_BASE_URL = "https://pxnet2.stat.fi:443/PXWeb/api/v1/en/ymp/taulukot/Kokodata.px"
+# Hosts the fetches of each source go to, for limiting the jobs per host.
+SMEAR_HOST = urlparse(SMEAR_BASE_URL).netloc
+STATFI_HOST = urlparse(STATFI_BASE_URL).netloc
 
 
 def createSMEARUrl(options: SMEAROptions) -> str:
@@ -13,7 +25,7 @@ def createSMEARUrl(options: SMEAROptions) -> str:
     # &to=2022-01-19T17:00:00.000&tablevariable=KUM_EDDY.av_c_ep'
     url = SMEAR_BASE_URL
     url += "?aggregation=" + options.aggregation_method.value
-    url += "&interval=" + options.interval
+    url += "&interval=" + getSMEARRequestInterval(options)
     url += "&from=" + options.start_date_time.isoformat()
     url += "&to=" + options.end_date_time.isoformat()
     for station_index in range(len(options.table_names)):
@@ -26,6 +38,57 @@ def createSMEARUrl(options: SMEAROptions) -> str:
     return url
 
 
+def createSMEARVariableUrl(tablevariables: list[str]) -> str:
+    # An example URL:
+    # 'https://smear-backend.rahtiapp.fi/search/variable
+    # ?tablevariable=KUM_EDDY.av_c_ep&tablevariable=HYY_META.CO2icos168'
+    url = SMEAR_VARIABLE_URL
+    url += "?" + "&".join(
+        "tablevariable=" + tablevariable for tablevariable in tablevariables
+    )
+    return url
+
+
+def estimateSMEARRowCount(options: SMEAROptions) -> int:
+    span = options.end_date_time - options.start_date_time
+    rows_per_station = span / timedelta(minutes=_getSMEARStepMinutes(options))
+    return int(rows_per_station) * len(options.stations)
+
+
+def createSMEARTimeWindows(
+    options: SMEAROptions, max_rows: int = consts.SMEAR_MAX_ROWS_PER_REQUEST
+) -> list[tuple[datetime, datetime]]:
+    # Split the requested range into consecutive, equally long windows of at most
+    # max_rows estimated rows. Window lengths are whole multiples of the interval
+    # so no aggregation bucket is split between two windows.
+    window_count = math.ceil(estimateSMEARRowCount(options) / max_rows)
+    if window_count <= 1:
+        return [(options.start_date_time, options.end_date_time)]
+
+    step = timedelta(minutes=_getSMEARStepMinutes(options))
+    steps = (options.end_date_time - options.start_date_time) / step
+    window_length = step * math.ceil(steps / window_count)
+    windows = []
+    window_start = options.start_date_time
+    while window_start < options.end_date_time:
+        window_end = min(window_start + window_length, options.end_date_time)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+def getSMEARRequestInterval(options: SMEAROptions) -> str:
+    # Non-aggregated data does not depend on the interval, so it is requested and
+    # cached the same way whatever the interval of the options is.
+    return str(_getSMEARStepMinutes(options))
+
+
+def _getSMEARStepMinutes(options: SMEAROptions) -> int:
+    if options.aggregation_method == SMEARAggregation.NONE:
+        return consts.SMEAR_RAW_RESOLUTION_MINUTES
+    return int(options.interval)
+
+
 def createSTATFIDataObject(options: STATFIOptions) -> dict[str, Any]:
     return {
         "query": [
@@ -40,3 +103,14 @@ def createSTATFIDataObject(options: STATFIOptions) -> dict[str, Any]:
         ],
         "response": {"format": "json-stat2"},
     }
+
+
+def createSTATFITableObject() -> dict[str, Any]:
+    # Every figure in every year, for a snapshot of the whole table.
+    return {
+        "query": [
+            {"code": "Tiedot", "selection": {"filter": "all", "values": ["*"]}},
+            {"code": "Vuosi", "selection": {"filter": "all", "values": ["*"]}},
+        ],
+        "response": {"format": "json-stat2"},
+    }
@@ -0,0 +1,81 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from model.data_models.station import Station
+from model.data_models.user_options import SMEARAggregation
+
+
+class ResampledSeries(NamedTuple):
+    # Start of each bucket, its aggregated value and the number of source samples.
+    time_stamps: np.ndarray
+    values: np.ndarray
+    counts: np.ndarray
+
+
+def canResample(
+    source_aggregation: SMEARAggregation,
+    source_interval: int,
+    target_aggregation: SMEARAggregation,
+    target_interval: int,
+) -> bool:
+    # Raw data can be aggregated in any way. Aggregated data can only be
+    # aggregated further with the same method into whole multiples of its buckets.
+    if source_aggregation == SMEARAggregation.NONE:
+        return True
+    return (
+        source_aggregation == target_aggregation
+        and target_interval >= source_interval
+        and target_interval % source_interval == 0
+    )
+
+
+def resample(
+    time_stamps: np.ndarray,
+    values: np.ndarray,
+    interval: int,
+    aggregation: SMEARAggregation,
+    counts: Optional[np.ndarray] = None,
+) -> ResampledSeries:
+    """Aggregate a series sorted by time into buckets of interval minutes,
+    aligned to whole intervals from midnight. counts weights the averages when
+    the values are averages themselves.
+    """
+    if counts is None:
+        counts = np.ones(len(values), dtype=np.int64)
+    if aggregation == SMEARAggregation.NONE or not len(values):
+        return ResampledSeries(time_stamps, values, counts)
+
+    bucket_ids = time_stamps.astype("datetime64[m]").astype(np.int64) // interval
+    starts = np.flatnonzero(np.diff(bucket_ids, prepend=bucket_ids[0] - 1))
+    bucket_counts = np.add.reduceat(counts, starts)
+    if aggregation == SMEARAggregation.MIN:
+        bucket_values = np.minimum.reduceat(values, starts)
+    elif aggregation == SMEARAggregation.MAX:
+        bucket_values = np.maximum.reduceat(values, starts)
+    elif aggregation == SMEARAggregation.AVG:
+        bucket_values = np.add.reduceat(values * counts, starts) / bucket_counts
+    else:
+        raise ValueError(f"Unknown aggregation method {aggregation}")
+
+    bucket_time_stamps = (
+        (bucket_ids[starts] * interval)
+        .astype("datetime64[m]")
+        .astype(time_stamps.dtype)
+    )
+    return ResampledSeries(bucket_time_stamps, bucket_values, bucket_counts)
+
+
+def resampleStation(
+    station: Station, interval: int, aggregation: SMEARAggregation
+) -> Station:
+    resampled = resample(
+        station.getTimeStampsArray(),
+        station.getConcentrationsArray(),
+        interval,
+        aggregation,
+    )
+    resampled_station = Station(station.getIdentifier())
+    resampled_station.setTimeStamps(resampled.time_stamps)
+    resampled_station.setConcentrations(resampled.values)
+    return resampled_station
@@ -0,0 +1,115 @@
+from dataclasses import replace
+from typing import Any, Iterable
+
+from model.data_models.fetch_results import (
+    ComparisonResult,
+    SMEARResult,
+    STATFIResult,
+)
+from model.data_models.station import Station
+from model.data_models.user_options import (
+    CompareOptions,
+    SMEARAggregation,
+    SMEAROptions,
+    STATFIOptions,
+)
+from model.factories.figure_factory import FigureFactory  # type: ignore
+from model.factories.station_factory import StationFactory  # type: ignore
+from model.utils.consts import (  # type: ignore
+    SMEAR_MAX_LOCAL_RESAMPLE_ROWS,
+    SMEAR_MAX_RAW_FETCH_ROWS,
+)
+from model.utils.data_fetcher import DataFetcher, isErrorDict  # type: ignore
+from model.utils.request_builder import estimateSMEARRowCount  # type: ignore
+from model.utils.resampler import canResample, resampleStation  # type: ignore
+
+
+class ResultBuilder:
+    """Fetches data and builds it into the result objects handed to the GUI
+    thread. Meant to run in a worker thread, so that decoding, building,
+    resampling and summarising do not block the window.
+    """
+
+    @staticmethod
+    def buildSMEARResult(options: SMEAROptions) -> SMEARResult:
+        source_options = ResultBuilder.getSMEARSourceOptions(options)
+        return ResultBuilder.buildSMEARResultFromData(
+            options, source_options, DataFetcher.fetchSMEARData(source_options)
+        )
+
+    @staticmethod
+    def buildSMEARResultFromData(
+        options: SMEAROptions, source_options: SMEAROptions, data: dict[str, Any]
+    ) -> SMEARResult:
+        if "error_message" in data:
+            return SMEARResult(
+                options, source_options, error_message=str(data["error_message"])
+            )
+        source_stations = StationFactory.build(data)
+        stations = ResultBuilder.resampleSMEARStations(
+            source_stations, source_options, options.aggregation_method
+        )
+        ResultBuilder._buildSummaries(stations)
+        return SMEARResult(
+            options, source_options, tuple(source_stations), tuple(stations)
+        )
+
+    @staticmethod
+    def getSMEARSourceOptions(options: SMEAROptions) -> SMEAROptions:
+        # Raw data is used when it is small enough, so that any aggregation can be
+        # computed from it locally. It is only fetched for short ranges, longer ones
+        # use it when it is already cached.
+        raw_options = replace(options, aggregation_method=SMEARAggregation.NONE)
+        raw_row_count = estimateSMEARRowCount(raw_options)
+        if raw_row_count <= SMEAR_MAX_RAW_FETCH_ROWS or (
+            raw_row_count <= SMEAR_MAX_LOCAL_RESAMPLE_ROWS
+            and DataFetcher.isSMEARDataCached(raw_options)
+        ):
+            return raw_options
+        return options
+
+    @staticmethod
+    def resampleSMEARStations(
+        source_stations: list[Station],
+        source_options: SMEAROptions,
+        aggregation: SMEARAggregation,
+    ) -> list[Station]:
+        interval = int(source_options.interval)
+        if source_options.aggregation_method == aggregation or not canResample(
+            source_options.aggregation_method, interval, aggregation, interval
+        ):
+            return source_stations
+        return [
+            resampleStation(station, interval, aggregation)
+            for station in source_stations
+        ]
+
+    @staticmethod
+    def buildSTATFIResult(options: STATFIOptions) -> STATFIResult:
+        data = DataFetcher.fetchSTATFIData(options)
+        if isErrorDict(data):
+            return STATFIResult(error_message=str(data["error_message"]))
+        return STATFIResult(tuple(FigureFactory.build(data)))
+
+    @staticmethod
+    def buildComparisonResult(options: CompareOptions) -> ComparisonResult:
+        data = DataFetcher.fetchComparisonData(options)
+        if not data:
+            return ComparisonResult()
+        for part in [*data["STATFI"], *data["SMEAR"]]:
+            if isErrorDict(part):
+                return ComparisonResult(error_message=str(part["error_message"]))
+
+        stations = [StationFactory.build(SMEAR_data) for SMEAR_data in data["SMEAR"]]
+        for year_stations in stations:
+            ResultBuilder._buildSummaries(year_stations)
+        return ComparisonResult(
+            tuple(FigureFactory.build(data["STATFI"][0])),
+            tuple(tuple(year_stations) for year_stations in stations),
+        )
+
+    @staticmethod
+    def _buildSummaries(stations: Iterable[Station]):
+        # Plotting reads envelopes and averages from the summary pyramids.
+        for station in stations:
+            station.getSummaryPyramid()
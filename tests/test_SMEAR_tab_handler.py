@@ -0,0 +1,40 @@
+from dataclasses import replace
+from datetime import datetime
+
+from app import Window
+from model.data_models.station import Station
+from model.data_models.user_options import SMEARAggregation, SMEARGas, SMEAROptions
+from model.utils.request_builder import SMEAR_HOST
+from model.utils.result_builder import ResultBuilder
+
+
+def test_aggregation_not_resampled_locally_is_fetched(qapp, monkeypatch):
+    window = Window()
+    handler = window.getTabHandler("SMEAR")
+    # Averages of a long range, fetched aggregated by SMEAR.
+    options = SMEAROptions(
+        SMEARGas.CO2,
+        SMEARAggregation.AVG,
+        datetime(2016, 1, 1),
+        datetime(2016, 6, 1),
+        ["Kumpula"],
+    )
+    handler._ui_options = options
+    handler._source_options = options
+    handler._source_stations = [Station("Kumpula")]
+    fetches = []
+    monkeypatch.setattr(
+        handler, "_fetchInBackground", lambda *args, **kwargs: fetches.append(args)
+    )
+
+    window.SMEAR_max_radio_button.click()
+
+    assert fetches == [
+        (
+            "data",
+            ResultBuilder.buildSMEARResult,
+            replace(options, aggregation_method=SMEARAggregation.MAX),
+            "_visualise",
+            [SMEAR_HOST],
+        )
+    ]
@@ -0,0 +1,73 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+import cli
+from model.data_models.user_options import SMEARAggregation, SMEARGas, SMEAROptions
+from model.utils import consts
+from model.utils.SMEAR_cache import SMEARCache
+
+START = datetime(2016, 1, 1)
+END = datetime(2016, 1, 2)
+
+
+def _cacheRawKumpulaDay():
+    # The rendered day is served from the cache, so nothing is fetched.
+    options = SMEAROptions(
+        SMEARGas.CO2, SMEARAggregation.NONE, START, END, ["Kumpula"], "1"
+    )
+    samptimes = np.arange(
+        np.datetime64(START, "ms"), np.datetime64(END, "ms"), np.timedelta64(1, "m")
+    )
+    SMEARCache(consts.SMEAR_CACHE_DIRECTORY).store(
+        f"{options.table_names[0]}.{options.variable_names[0]}",
+        "NONE",
+        "1",
+        (START, END),
+        samptimes,
+        np.linspace(400, 420, len(samptimes)),
+    )
+
+
+def _writeOptionsFile(path, SMEAR_options):
+    with open(path, "w", encoding="utf-8") as options_file:
+        json.dump(
+            {
+                "SMEAR": SMEAR_options,
+                "STATFI": {"figure_names": [], "years": [], "plot_type": "LINE_GRAPH"},
+                "compare": {
+                    "STATFI_figure_names": [],
+                    "STATFI_years": [],
+                    "SMEAR_gas": "CO2",
+                    "SMEAR_stations": [],
+                    "SMEAR_years": [],
+                },
+            },
+            options_file,
+        )
+
+
+def test_bad_options_file_does_not_stop_the_others(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _cacheRawKumpulaDay()
+    good_options = {
+        "gas": "CO2",
+        "aggregation_method": "AVG",
+        "start_date_time": "2016-01-01 00:00:00",
+        "end_date_time": "2016-01-02 00:00:00",
+        "stations": ["Kumpula"],
+        "interval": "60",
+    }
+    _writeOptionsFile(tmp_path / "a_bad.json", {**good_options, "colour": "red"})
+    _writeOptionsFile(tmp_path / "b_good.json", good_options)
+
+    exit_code = cli.main(
+        [str(tmp_path / "a_bad.json"), str(tmp_path / "b_good.json"), "-o", "out"]
+        + ["-j", "2", "--tabs", "SMEAR"]
+    )
+
+    assert exit_code == 1
+    assert sorted(os.listdir("out")) == ["b_good_SMEAR.csv", "b_good_SMEAR.png"]
+    assert "a_bad.json: TypeError" in capsys.readouterr().err
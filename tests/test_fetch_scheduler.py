@@ -0,0 +1,32 @@
+from PyQt6.QtCore import QCoreApplication, QObject, QThreadPool, pyqtSlot
+
+from model.data_models.fetch_results import FetchFailure
+from model.utils.fetch_scheduler import FetchScheduler
+
+
+class _Owner(QObject):
+    def __init__(self):
+        super().__init__()
+        self.results = []
+
+    @pyqtSlot(object)
+    def onFinished(self, result):
+        self.results.append(result)
+
+
+def _raiseError(_):
+    raise RuntimeError("no connection")
+
+
+def test_raising_job_reaches_the_callback_as_a_fetch_failure():
+    application = QCoreApplication.instance() or QCoreApplication([])
+    scheduler = FetchScheduler()
+    owner = _Owner()
+
+    scheduler.schedule("job", _raiseError, None, owner, "onFinished", hosts=["host"])
+    QThreadPool.globalInstance().waitForDone()
+    application.processEvents()
+
+    assert owner.results == [FetchFailure("The request failed: no connection")]
+    assert scheduler.getJobsPerHost() == {}
+    assert scheduler.getQueueDepth()["running"] == 0
@@ -56,8 +56,9 @@ class QtWaitingSpinner(QDialog):
         self.setFixedSize(size, size)
 
     def updateTimer(self):
+        # Newer PyQt6 versions only accept whole milliseconds.
         self.timer.setInterval(
-            1000.0 / (self.mNumberOfLines * self.mRevolutionsPerSecond)
+            int(1000.0 / (self.mNumberOfLines * self.mRevolutionsPerSecond))
         )
 
     def updatePosition(self):
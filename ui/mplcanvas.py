@@ -0,0 +1,20 @@
+# Imports
+import matplotlib  # type: ignore
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as Canvas  # type: ignore
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar  # type: ignore # noqa: F401
+from matplotlib.figure import Figure  # type: ignore
+
+# Ensure using PyQt6 backend
+matplotlib.use("QTAgg")
+
+
+# Matplotlib canvas class to create figure
+class MplCanvas(Canvas):
+    fig: Figure
+    ax: matplotlib.axes.Axes
+
+    def __init__(self):
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot(111)
+        Canvas.__init__(self, self.fig)
+        Canvas.updateGeometry(self)
@@ -1,33 +1,44 @@
 # Imports
-import matplotlib  # type: ignore
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as Canvas  # type: ignore
-from matplotlib.figure import Figure  # type: ignore
-from PyQt6 import QtWidgets
-
-# Ensure using PyQt6 backend
-matplotlib.use("QTAgg")
+from typing import TYPE_CHECKING, Optional
 
+from PyQt6 import QtWidgets
 
-# Matplotlib canvas class to create figure
-class MplCanvas(Canvas):
-    fig: Figure
-    ax: matplotlib.axes.Axes
-
-    def __init__(self):
-        self.fig = Figure()
-        self.ax = self.fig.add_subplot(111)
-        Canvas.__init__(self, self.fig)
-        Canvas.updateGeometry(self)
+# Matplotlib is only loaded with the first canvas, so that the window can be
+# shown before it is imported.
+if TYPE_CHECKING:
+    from ui.mplcanvas import MplCanvas, NavigationToolbar
 
 
-# Matplotlib widget
+# Matplotlib widget. The canvas and its toolbar are created when first used, e.g.
+# by the plotter of the tab.
 class MplWidget(QtWidgets.QWidget):
-    canvas: MplCanvas
+    _canvas: Optional["MplCanvas"]
+    _toolbar: Optional["NavigationToolbar"]
     vbl: QtWidgets.QVBoxLayout
 
     def __init__(self, parent=None):
         QtWidgets.QWidget.__init__(self, parent)  # Inherit from QWidget
-        self.canvas = MplCanvas()  # Create canvas object
+        self._canvas = None
+        self._toolbar = None
         self.vbl = QtWidgets.QVBoxLayout()  # Set box for plotting
-        self.vbl.addWidget(self.canvas)
         self.setLayout(self.vbl)
+
+    @property
+    def canvas(self) -> "MplCanvas":
+        self._createCanvas()
+        return self._canvas  # type: ignore
+
+    @property
+    def toolbar(self) -> "NavigationToolbar":
+        self._createCanvas()
+        return self._toolbar  # type: ignore
+
+    def _createCanvas(self):
+        if self._canvas is not None:
+            return
+        from ui.mplcanvas import MplCanvas, NavigationToolbar
+
+        self._canvas = MplCanvas()  # Create canvas object
+        self._toolbar = NavigationToolbar(self._canvas, self)  # Zoom and pan controls
+        self.vbl.addWidget(self._toolbar)
+        self.vbl.addWidget(self._canvas)